@@ -204,7 +204,7 @@ def process_scenario_file(json_path: Path) -> tuple:
         # 步骤3: 处理V2X消息（使用原有逻辑）
         for topic in ['/v2x/cam', '/v2x/denm', '/v2x/raw']:
             if topic in data:
-                msgs = extract_v2x_from_topic(data, topic)
+                msgs = extract_v2x_from_topic(data[topic], topic).to_records()
                 v2x_messages.extend(msgs)
 
     except Exception as e:
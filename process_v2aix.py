@@ -45,6 +45,12 @@ def main():
         default='parquet',
         help='Output format (default: parquet)'
     )
+    parser.add_argument(
+        '--workers', '-w',
+        type=int,
+        default=None,
+        help='Number of worker processes (default: CPU count)'
+    )
     parser.add_argument(
         '--verbose', '-v',
         action='store_true',
@@ -68,7 +74,8 @@ def main():
         stats = process_dataset(
             input_dir=args.input,
             output_dir=args.output,
-            output_format=args.format
+            output_format=args.format,
+            workers=args.workers
         )
 
         logger.info("=" * 60)
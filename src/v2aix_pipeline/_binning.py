@@ -0,0 +1,118 @@
+"""
+Uniform 2D grid binning kernels used by the heatmap plots.
+
+Points are assigned to half-open cells [edge_i, edge_i+1) of a uniform grid
+over [xmin, xmax) x [ymin, ymax); points outside that range (including the
+max edges) and NaN coordinates are dropped.
+"""
+
+from __future__ import annotations
+
+from typing import Tuple
+
+import numpy as np
+
+# Optional numba for a compiled, multi-threaded binning kernel
+try:
+    from numba import get_num_threads, njit, prange
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+    prange = range
+
+
+def _bin2d_loop(
+    x: np.ndarray,
+    y: np.ndarray,
+    weights: np.ndarray,
+    xmin: float,
+    xmax: float,
+    ymin: float,
+    ymax: float,
+    nx: int,
+    ny: int,
+    n_chunks: int
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Scatter points into per-chunk grids, then reduce over chunks.
+
+    Compiled with numba (parallel over chunks) when available; each chunk
+    owns its own grid so no atomics are needed.
+    """
+    n = x.shape[0]
+    sums = np.zeros((n_chunks, ny, nx))
+    counts = np.zeros((n_chunks, ny, nx), dtype=np.int64)
+    x_scale = nx / (xmax - xmin)
+    y_scale = ny / (ymax - ymin)
+    chunk_size = (n + n_chunks - 1) // n_chunks
+
+    for c in prange(n_chunks):
+        for i in range(c * chunk_size, min(n, (c + 1) * chunk_size)):
+            xi = x[i]
+            yi = y[i]
+            # Written so that NaN coordinates are rejected as well
+            if not (xi >= xmin and xi < xmax and yi >= ymin and yi < ymax):
+                continue
+            ix = min(int((xi - xmin) * x_scale), nx - 1)
+            iy = min(int((yi - ymin) * y_scale), ny - 1)
+            sums[c, iy, ix] += weights[i]
+            counts[c, iy, ix] += 1
+
+    return sums.sum(axis=0), counts.sum(axis=0)
+
+
+def _bin2d_numpy(
+    x: np.ndarray,
+    y: np.ndarray,
+    weights: np.ndarray,
+    xmin: float,
+    xmax: float,
+    ymin: float,
+    ymax: float,
+    nx: int,
+    ny: int,
+    n_chunks: int
+) -> Tuple[np.ndarray, np.ndarray]:
+    """NumPy fallback for _bin2d_loop when numba is not installed."""
+    inside = (x >= xmin) & (x < xmax) & (y >= ymin) & (y < ymax)
+    ix = np.minimum(((x[inside] - xmin) * (nx / (xmax - xmin))).astype(np.int64), nx - 1)
+    iy = np.minimum(((y[inside] - ymin) * (ny / (ymax - ymin))).astype(np.int64), ny - 1)
+    flat = iy * nx + ix
+
+    sums = np.bincount(flat, weights=weights[inside], minlength=nx * ny)
+    counts = np.bincount(flat, minlength=nx * ny)
+    return sums.reshape(ny, nx), counts.reshape(ny, nx)
+
+
+_bin2d = njit(parallel=True, cache=True)(_bin2d_loop) if HAS_NUMBA else _bin2d_numpy
+
+
+def bin2d_sum_count(
+    x: np.ndarray,
+    y: np.ndarray,
+    weights: np.ndarray,
+    xmin: float,
+    xmax: float,
+    ymin: float,
+    ymax: float,
+    nx: int,
+    ny: int
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Sum weights and count points per cell of a uniform grid.
+
+    Args:
+        x, y: Point coordinates
+        weights: Weight per point
+        xmin, xmax, ymin, ymax: Grid range (xmax > xmin, ymax > ymin)
+        nx, ny: Number of cells along x and y
+
+    Returns:
+        Tuple of (sums, counts), each of shape (ny, nx) indexed [y_cell, x_cell]
+    """
+    n_chunks = get_num_threads() if HAS_NUMBA else 1
+    return _bin2d(
+        np.ascontiguousarray(x, dtype=np.float64),
+        np.ascontiguousarray(y, dtype=np.float64),
+        np.ascontiguousarray(weights, dtype=np.float64),
+        float(xmin), float(xmax), float(ymin), float(ymax),
+        int(nx), int(ny), n_chunks
+    )
@@ -10,6 +10,7 @@ from __future__ import annotations
 
 import json
 import logging
+from operator import attrgetter
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
 
@@ -267,9 +268,8 @@ def filter_by_bbox(
 
         filtered = []
         for vehicle_id, vehicle_records in by_vehicle.items():
-            # Sort by timestamp and check first point
-            sorted_records = sorted(vehicle_records, key=lambda r: r.timestamp_utc_ms)
-            first = sorted_records[0]
+            # Check first point (earliest timestamp; no need to sort)
+            first = min(vehicle_records, key=attrgetter('timestamp_utc_ms'))
 
             if (min_lon <= first.longitude_deg <= max_lon and
                 min_lat <= first.latitude_deg <= max_lat):
@@ -350,9 +350,8 @@ def filter_by_polygon(
 
         filtered = []
         for vehicle_id, vehicle_records in by_vehicle.items():
-            # Sort by timestamp and check first point
-            sorted_records = sorted(vehicle_records, key=lambda r: r.timestamp_utc_ms)
-            first = sorted_records[0]
+            # Check first point (earliest timestamp; no need to sort)
+            first = min(vehicle_records, key=attrgetter('timestamp_utc_ms'))
 
             if polygon.contains(Point(first.longitude_deg, first.latitude_deg)):
                 filtered.extend(vehicle_records)
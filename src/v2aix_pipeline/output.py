@@ -7,10 +7,13 @@ Combines trajectories with V2X metrics and exports to Parquet/CSV.
 from __future__ import annotations
 
 import logging
+from bisect import bisect_left, bisect_right
 from collections import defaultdict
+from operator import attrgetter, itemgetter
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
 
+import numpy as np
 import pandas as pd
 
 from .models import FusedRecord, TrajectorySample, V2XMessageRecord
@@ -22,41 +25,19 @@ logger = logging.getLogger(__name__)
 # V2X Metrics Aggregation
 # ============================================================================
 
-def aggregate_v2x_metrics(
-    v2x_records: List[V2XMessageRecord],
-    timestamp_ms: int,
-    sync_tolerance_ms: int = 500
-) -> Dict[str, any]:
-    """Aggregate V2X metrics around a timestamp.
+def _record_time(rec: V2XMessageRecord) -> Optional[int]:
+    """Event time used for windowing (generic, then tx, then rx timestamp)."""
+    return rec.timestamp_utc_ms or rec.tx_timestamp_utc_ms or rec.rx_timestamp_utc_ms
 
-    Args:
-        v2x_records: List of V2X message records
-        timestamp_ms: Center timestamp in milliseconds
-        sync_tolerance_ms: Time window (±tolerance) for aggregation
-
-    Returns:
-        Dictionary with aggregated metrics:
-        - tx_bytes: Total transmitted bytes
-        - rx_bytes: Total received bytes
-        - msg_counts: Dict of message_type -> count
-        - avg_latency_ms: Average latency (if available)
-    """
-    window_start = timestamp_ms - sync_tolerance_ms
-    window_end = timestamp_ms + sync_tolerance_ms
 
+def _summarize_v2x(records: Iterable[V2XMessageRecord]) -> Dict[str, any]:
+    """Aggregate metrics over records already known to be in the window."""
     tx_bytes = 0
     rx_bytes = 0
     msg_counts = defaultdict(int)
     latencies = []
 
-    for rec in v2x_records:
-        # Check if record is in time window
-        rec_time = rec.timestamp_utc_ms or rec.tx_timestamp_utc_ms or rec.rx_timestamp_utc_ms
-        if rec_time is None:
-            continue
-        if not (window_start <= rec_time <= window_end):
-            continue
-
+    for rec in records:
         # Aggregate payload
         if rec.payload_bytes is not None:
             if rec.direction and 'uplink' in str(rec.direction):
@@ -82,40 +63,85 @@ def aggregate_v2x_metrics(
     }
 
 
-# ============================================================================
-# Data Fusion
-# ============================================================================
-
-def fuse_trajectory_with_v2x(
-    trajectory: List[TrajectorySample],
+def aggregate_v2x_metrics(
     v2x_records: List[V2XMessageRecord],
+    timestamp_ms: int,
     sync_tolerance_ms: int = 500
-) -> List[FusedRecord]:
-    """Fuse trajectory samples with V2X metrics.
+) -> Dict[str, any]:
+    """Aggregate V2X metrics around a timestamp.
 
     Args:
-        trajectory: List of trajectory samples (1Hz)
         v2x_records: List of V2X message records
-        sync_tolerance_ms: Time synchronization tolerance
+        timestamp_ms: Center timestamp in milliseconds
+        sync_tolerance_ms: Time window (±tolerance) for aggregation
 
     Returns:
-        List of FusedRecord objects
+        Dictionary with aggregated metrics:
+        - tx_bytes: Total transmitted bytes
+        - rx_bytes: Total received bytes
+        - msg_counts: Dict of message_type -> count
+        - avg_latency_ms: Average latency (if available)
     """
-    # Group V2X records by vehicle
-    v2x_by_vehicle = defaultdict(list)
+    window_start = timestamp_ms - sync_tolerance_ms
+    window_end = timestamp_ms + sync_tolerance_ms
+
+    in_window = []
     for rec in v2x_records:
-        v2x_by_vehicle[rec.vehicle_id].append(rec)
+        # Check if record is in time window
+        rec_time = _record_time(rec)
+        if rec_time is None:
+            continue
+        if window_start <= rec_time <= window_end:
+            in_window.append(rec)
+
+    return _summarize_v2x(in_window)
+
+
+# ============================================================================
+# Data Fusion
+# ============================================================================
+
+def _index_v2x_by_vehicle(
+    v2x_records: List[V2XMessageRecord]
+) -> Dict[str, Tuple[List[int], List[V2XMessageRecord]]]:
+    """Group V2X records by vehicle, sorted by event time.
+
+    Returns:
+        Dict of vehicle_id -> (sorted event times, records in the same order);
+        records without an event time are dropped
+    """
+    by_vehicle = defaultdict(list)
+    for rec in v2x_records:
+        rec_time = _record_time(rec)
+        if rec_time is not None:
+            by_vehicle[rec.vehicle_id].append((rec_time, rec))
+
+    index = {}
+    for vehicle_id, timed in by_vehicle.items():
+        timed.sort(key=itemgetter(0))
+        index[vehicle_id] = ([t for t, _ in timed], [rec for _, rec in timed])
+    return index
 
+
+def _fuse_with_index(
+    trajectory: List[TrajectorySample],
+    v2x_index: Dict[str, Tuple[List[int], List[V2XMessageRecord]]],
+    sync_tolerance_ms: int
+) -> List[FusedRecord]:
+    """Fuse samples against a per-vehicle index from _index_v2x_by_vehicle.
+
+    Each sample's window is located by binary search on the sorted event
+    times, so the cost is O(log M) per sample plus the window size.
+    """
+    empty = ([], [])
     fused = []
     for sample in trajectory:
-        vehicle_v2x = v2x_by_vehicle.get(sample.vehicle_id, [])
+        times, records = v2x_index.get(sample.vehicle_id, empty)
 
         # Aggregate V2X metrics around this timestamp
-        metrics = aggregate_v2x_metrics(
-            vehicle_v2x,
-            sample.timestamp_utc_ms,
-            sync_tolerance_ms
-        )
+        lo = bisect_left(times, sample.timestamp_utc_ms - sync_tolerance_ms)
+        hi = bisect_right(times, sample.timestamp_utc_ms + sync_tolerance_ms)
+        metrics = _summarize_v2x(records[lo:hi])
 
         fused_rec = FusedRecord(
             vehicle_id=sample.vehicle_id,
@@ -129,6 +155,28 @@ def fuse_trajectory_with_v2x(
         )
         fused.append(fused_rec)
 
+    return fused
+
+
+def fuse_trajectory_with_v2x(
+    trajectory: List[TrajectorySample],
+    v2x_records: List[V2XMessageRecord],
+    sync_tolerance_ms: int = 500
+) -> List[FusedRecord]:
+    """Fuse trajectory samples with V2X metrics.
+
+    Args:
+        trajectory: List of trajectory samples (1Hz)
+        v2x_records: List of V2X message records
+        sync_tolerance_ms: Time synchronization tolerance
+
+    Returns:
+        List of FusedRecord objects
+    """
+    fused = _fuse_with_index(
+        trajectory, _index_v2x_by_vehicle(v2x_records), sync_tolerance_ms
+    )
+
     logger.info(f"Fused {len(fused)} trajectory samples with V2X metrics")
     return fused
 
@@ -148,9 +196,12 @@ def fuse_all(
     Returns:
         List of all fused records
     """
+    # Index the V2X records once for all vehicles
+    v2x_index = _index_v2x_by_vehicle(v2x_records)
+
     all_fused = []
     for vehicle_id, trajectory in trajectories_by_vehicle.items():
-        fused = fuse_trajectory_with_v2x(trajectory, v2x_records, sync_tolerance_ms)
+        fused = _fuse_with_index(trajectory, v2x_index, sync_tolerance_ms)
         all_fused.extend(fused)
 
     logger.info(f"Total fused records: {len(all_fused)} from {len(trajectories_by_vehicle)} vehicles")
@@ -161,6 +212,57 @@ def fuse_all(
 # Export Functions
 # ============================================================================
 
+# Export column name -> (record attribute, dtype); object columns stay lists
+TRAJECTORY_EXPORT_COLUMNS = {
+    'vehicle_id': ('vehicle_id', object),
+    'timestamp_utc_ms': ('timestamp_utc_ms', np.int64),
+    'lat_deg': ('lat_deg', np.float64),
+    'lon_deg': ('lon_deg', np.float64),
+    'alt_m': ('alt_m', np.float64),
+    'x_m': ('x_m', np.float64),
+    'y_m': ('y_m', np.float64),
+    'speed_mps': ('speed_mps', np.float64),
+    'heading_deg': ('heading_deg', np.float64),
+    'quality_gap': ('quality.gap', np.bool_),
+    'quality_extrapolated': ('quality.extrapolated', np.bool_),
+    'quality_low_speed': ('quality.low_speed', np.bool_),
+}
+
+FUSED_EXPORT_COLUMNS = {
+    'vehicle_id': ('vehicle_id', object),
+    'timestamp_utc_ms': ('timestamp_utc_ms', np.int64),
+    'x_m': ('x_m', np.float64),
+    'y_m': ('y_m', np.float64),
+    'tx_bytes': ('tx_bytes', np.int64),
+    'rx_bytes': ('rx_bytes', np.int64),
+    'avg_latency_ms': ('avg_latency_ms', np.float64),
+}
+
+
+def _records_to_columns(
+    records: Sequence[Any],
+    columns: Dict[str, Tuple[str, Any]],
+    names: Optional[Iterable[str]] = None
+) -> Dict[str, Any]:
+    """Extract export columns as typed arrays (None -> NaN for floats).
+
+    Args:
+        records: Trajectory samples or fused records
+        columns: Export column spec (see TRAJECTORY_EXPORT_COLUMNS)
+        names: Optional subset of columns, in output order
+
+    Returns:
+        Dict of column name -> array (or list for object columns)
+    """
+    n = len(records)
+    data = {}
+    for name in (columns if names is None else names):
+        attribute, dtype = columns[name]
+        values = map(attrgetter(attribute), records)
+        data[name] = list(values) if dtype is object else np.fromiter(values, dtype=dtype, count=n)
+    return data
+
+
 def export_trajectories_to_parquet(
     trajectories: List[TrajectorySample],
     output_path: Path
@@ -176,21 +278,7 @@ def export_trajectories_to_parquet(
         return
 
     # Convert to DataFrame
-    data = {
-        'vehicle_id': [t.vehicle_id for t in trajectories],
-        'timestamp_utc_ms': [t.timestamp_utc_ms for t in trajectories],
-        'lat_deg': [t.lat_deg for t in trajectories],
-        'lon_deg': [t.lon_deg for t in trajectories],
-        'alt_m': [t.alt_m for t in trajectories],
-        'x_m': [t.x_m for t in trajectories],
-        'y_m': [t.y_m for t in trajectories],
-        'speed_mps': [t.speed_mps for t in trajectories],
-        'heading_deg': [t.heading_deg for t in trajectories],
-        'quality_gap': [t.quality.gap for t in trajectories],
-        'quality_extrapolated': [t.quality.extrapolated for t in trajectories],
-        'quality_low_speed': [t.quality.low_speed for t in trajectories]
-    }
-    df = pd.DataFrame(data)
+    df = pd.DataFrame(_records_to_columns(trajectories, TRAJECTORY_EXPORT_COLUMNS))
 
     # Export
     output_path.parent.mkdir(parents=True, exist_ok=True)
@@ -213,15 +301,7 @@ def export_fused_to_parquet(
         return
 
     # Convert to DataFrame
-    data = {
-        'vehicle_id': [r.vehicle_id for r in fused_records],
-        'timestamp_utc_ms': [r.timestamp_utc_ms for r in fused_records],
-        'x_m': [r.x_m for r in fused_records],
-        'y_m': [r.y_m for r in fused_records],
-        'tx_bytes': [r.tx_bytes for r in fused_records],
-        'rx_bytes': [r.rx_bytes for r in fused_records],
-        'avg_latency_ms': [r.avg_latency_ms for r in fused_records]
-    }
+    data = _records_to_columns(fused_records, FUSED_EXPORT_COLUMNS)
 
     # Handle msg_counts dict
     all_msg_types = set()
@@ -229,7 +309,11 @@ def export_fused_to_parquet(
         all_msg_types.update(r.msg_counts.keys())
 
     for msg_type in sorted(all_msg_types):
-        data[f'msg_count_{msg_type}'] = [r.msg_counts.get(msg_type, 0) for r in fused_records]
+        data[f'msg_count_{msg_type}'] = np.fromiter(
+            (r.msg_counts.get(msg_type, 0) for r in fused_records),
+            dtype=np.int64,
+            count=len(fused_records)
+        )
 
     df = pd.DataFrame(data)
 
@@ -254,28 +338,20 @@ def export_to_csv(
     output_dir.mkdir(parents=True, exist_ok=True)
 
     if trajectories:
-        data = {
-            'vehicle_id': [t.vehicle_id for t in trajectories],
-            'timestamp_utc_ms': [t.timestamp_utc_ms for t in trajectories],
-            'lat_deg': [t.lat_deg for t in trajectories],
-            'lon_deg': [t.lon_deg for t in trajectories],
-            'x_m': [t.x_m for t in trajectories],
-            'y_m': [t.y_m for t in trajectories],
-        }
+        data = _records_to_columns(
+            trajectories, TRAJECTORY_EXPORT_COLUMNS,
+            ['vehicle_id', 'timestamp_utc_ms', 'lat_deg', 'lon_deg', 'x_m', 'y_m']
+        )
         df = pd.DataFrame(data)
         csv_path = output_dir / 'trajectories.csv'
         df.to_csv(csv_path, index=False)
         logger.info(f"Exported trajectories to {csv_path}")
 
     if fused_records:
-        data = {
-            'vehicle_id': [r.vehicle_id for r in fused_records],
-            'timestamp_utc_ms': [r.timestamp_utc_ms for r in fused_records],
-            'x_m': [r.x_m for r in fused_records],
-            'y_m': [r.y_m for r in fused_records],
-            'tx_bytes': [r.tx_bytes for r in fused_records],
-            'rx_bytes': [r.rx_bytes for r in fused_records]
-        }
+        data = _records_to_columns(
+            fused_records, FUSED_EXPORT_COLUMNS,
+            ['vehicle_id', 'timestamp_utc_ms', 'x_m', 'y_m', 'tx_bytes', 'rx_bytes']
+        )
         df = pd.DataFrame(data)
         csv_path = output_dir / 'fused.csv'
         df.to_csv(csv_path, index=False)
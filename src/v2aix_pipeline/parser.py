@@ -8,20 +8,72 @@ Supports both GNSS pose records and V2X message records.
 
 from __future__ import annotations
 
+import json
 import logging
+from itertools import chain, islice
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
 
 from .models import Direction, GnssRecord, V2XMessageRecord
 
+# Optional fastnumbers for C-level drop-in replacements of int()/float()
+try:
+    from fastnumbers import float as _to_float, int as _to_int
+    HAS_FASTNUMBERS = True
+except ImportError:
+    HAS_FASTNUMBERS = False
+    _to_float = float
+    _to_int = int
+
+# Optional orjson for faster whole-file JSON decoding
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+# Optional ijson for streaming large JSON arrays
+try:
+    import ijson
+    HAS_IJSON = True
+except ImportError:
+    HAS_IJSON = False
+
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Number of objects handed to parse_records per batch when parsing a file
+PARSE_BATCH_SIZE = 65536
+
+# Files at least this large are streamed object by object (requires ijson)
+STREAMING_THRESHOLD_BYTES = 256 * 1024 * 1024
+
 
 # ============================================================================
 # Timestamp Utilities
 # ============================================================================
 
+# Units indexed by magnitude class (< 10^10, < 10^13, otherwise), and the
+# conversion to milliseconds for each as ts * multiplier // divisor
+_TIMESTAMP_UNITS = ('seconds', 'milliseconds', 'microseconds')
+_TIMESTAMP_UNIT_INDEX = {unit: i for i, unit in enumerate(_TIMESTAMP_UNITS)}
+_MS_MULTIPLIERS = (1000, 1, 1)
+_MS_DIVISORS = (1, 1, 1000)
+_MS_MULTIPLIERS_ARRAY = np.array(_MS_MULTIPLIERS, dtype=np.int64)
+_MS_DIVISORS_ARRAY = np.array(_MS_DIVISORS, dtype=np.int64)
+
+
+def _timestamp_unit_index(unit: str) -> int:
+    """Index of an explicit unit in the unit tables."""
+    try:
+        return _TIMESTAMP_UNIT_INDEX[unit]
+    except KeyError:
+        raise ValueError(f"Unknown timestamp unit: {unit}") from None
+
+
 def detect_timestamp_unit(timestamp: int | float) -> str:
     """Detect the unit of a timestamp (seconds, milliseconds, or microseconds).
 
@@ -37,14 +89,8 @@ def detect_timestamp_unit(timestamp: int | float) -> str:
         - Milliseconds: 1000000000000 to 9999999999999
         - Microseconds: > 1000000000000000
     """
-    ts_value = int(timestamp)
-
-    if ts_value < 10_000_000_000:  # < 10^10
-        return 'seconds'
-    elif ts_value < 10_000_000_000_000:  # < 10^13
-        return 'milliseconds'
-    else:
-        return 'microseconds'
+    ts_value = _to_int(timestamp)
+    return _TIMESTAMP_UNITS[(ts_value >= 10_000_000_000) + (ts_value >= 10_000_000_000_000)]
 
 
 def normalize_timestamp(timestamp: int | float, unit: Optional[str] = None) -> int:
@@ -66,25 +112,70 @@ def normalize_timestamp(timestamp: int | float, unit: Optional[str] = None) -> i
         >>> normalize_timestamp(1678901234000000)  # microseconds
         1678901234000
     """
+    ts_value = _to_int(timestamp)
     if unit is None:
-        unit = detect_timestamp_unit(timestamp)
+        index = (ts_value >= 10_000_000_000) + (ts_value >= 10_000_000_000_000)
+    else:
+        index = _timestamp_unit_index(unit)
+    return ts_value * _MS_MULTIPLIERS[index] // _MS_DIVISORS[index]
+
+
+def normalize_timestamp_array(timestamps: np.ndarray, unit: Optional[str] = None) -> np.ndarray:
+    """Normalize an array of timestamps to milliseconds since Unix epoch.
+
+    Vectorized normalize_timestamp: when unit is None it is detected per
+    element, by indexing the conversion tables with the magnitude class.
+
+    Args:
+        timestamps: Numeric timestamp array (floats are truncated like int())
+        unit: Optional explicit unit ('seconds', 'milliseconds', 'microseconds')
+              If None, will auto-detect per element
 
-    ts_value = int(timestamp)
+    Returns:
+        int64 array of timestamps in milliseconds
+    """
+    ts = np.asarray(timestamps)
+    if ts.dtype != np.int64:
+        ts = ts.astype(np.int64)
 
-    if unit == 'seconds':
-        return ts_value * 1000
-    elif unit == 'milliseconds':
-        return ts_value
-    elif unit == 'microseconds':
-        return ts_value // 1000
+    if unit is None:
+        index = (ts >= 10_000_000_000).astype(np.intp)
+        index += ts >= 10_000_000_000_000
     else:
-        raise ValueError(f"Unknown timestamp unit: {unit}")
+        index = _timestamp_unit_index(unit)
+
+    return ts * _MS_MULTIPLIERS_ARRAY[index] // _MS_DIVISORS_ARRAY[index]
 
 
 # ============================================================================
 # Field Extraction Utilities
 # ============================================================================
 
+# Fallback keys per field, tried in order after the canonical key (which
+# each extractor checks first, since it is by far the most common)
+_VEHICLE_ID_KEYS = ('station_id', 'vehicleID', 'vehicle_id', 'id')
+_STATION_TYPE_KEYS = ('station_type',)
+_LATITUDE_KEYS = ('lat', 'latitude_deg')
+_LONGITUDE_KEYS = ('lon', 'longitude_deg')
+_ALTITUDE_KEYS = ('alt', 'altitude_m')
+_SPEED_KEYS = ('speed_mps', 'speedMps')
+_HEADING_KEYS = ('heading_deg', 'headingDeg')
+_MESSAGE_TYPE_KEYS = ('message_type', 'msgType')
+_RSU_ID_KEYS = ('rsuID', 'rsuId')
+
+# Direction lookup by value (avoids Enum.__call__ and its exception on misses)
+_DIRECTION_MAP = {d.value: d for d in Direction}
+
+
+def _first_value(obj: Dict[str, Any], keys: Tuple[str, ...]) -> Any:
+    """Return the first non-None value among keys, or None."""
+    for key in keys:
+        value = obj.get(key)
+        if value is not None:
+            return value
+    return None
+
+
 def extract_vehicle_id(obj: Dict[str, Any]) -> Optional[str]:
     """Extract vehicle/station ID from JSON object.
 
@@ -99,10 +190,10 @@ def extract_vehicle_id(obj: Dict[str, Any]) -> Optional[str]:
     Returns:
         Vehicle ID as string, or None if not found
     """
-    for key in ['stationID', 'station_id', 'vehicleID', 'vehicle_id', 'id']:
-        if key in obj and obj[key] is not None:
-            return str(obj[key])
-    return None
+    value = obj.get('stationID')
+    if value is None:
+        value = _first_value(obj, _VEHICLE_ID_KEYS)
+    return None if value is None else str(value)
 
 
 def extract_station_type(obj: Dict[str, Any]) -> Optional[str]:
@@ -116,10 +207,10 @@ def extract_station_type(obj: Dict[str, Any]) -> Optional[str]:
     Returns:
         Station type as string, or None if not found
     """
-    for key in ['stationType', 'station_type']:
-        if key in obj and obj[key] is not None:
-            return str(obj[key])
-    return None
+    value = obj.get('stationType')
+    if value is None:
+        value = _first_value(obj, _STATION_TYPE_KEYS)
+    return None if value is None else str(value)
 
 
 def extract_latitude(obj: Dict[str, Any]) -> Optional[float]:
@@ -133,10 +224,10 @@ def extract_latitude(obj: Dict[str, Any]) -> Optional[float]:
     Returns:
         Latitude in degrees, or None if not found
     """
-    for key in ['latitude', 'lat', 'latitude_deg']:
-        if key in obj and obj[key] is not None:
-            return float(obj[key])
-    return None
+    value = obj.get('latitude')
+    if value is None:
+        value = _first_value(obj, _LATITUDE_KEYS)
+    return None if value is None else _to_float(value)
 
 
 def extract_longitude(obj: Dict[str, Any]) -> Optional[float]:
@@ -150,10 +241,10 @@ def extract_longitude(obj: Dict[str, Any]) -> Optional[float]:
     Returns:
         Longitude in degrees, or None if not found
     """
-    for key in ['longitude', 'lon', 'longitude_deg']:
-        if key in obj and obj[key] is not None:
-            return float(obj[key])
-    return None
+    value = obj.get('longitude')
+    if value is None:
+        value = _first_value(obj, _LONGITUDE_KEYS)
+    return None if value is None else _to_float(value)
 
 
 def extract_altitude(obj: Dict[str, Any]) -> Optional[float]:
@@ -167,10 +258,10 @@ def extract_altitude(obj: Dict[str, Any]) -> Optional[float]:
     Returns:
         Altitude in meters, or None if not found
     """
-    for key in ['altitude', 'alt', 'altitude_m']:
-        if key in obj and obj[key] is not None:
-            return float(obj[key])
-    return None
+    value = obj.get('altitude')
+    if value is None:
+        value = _first_value(obj, _ALTITUDE_KEYS)
+    return None if value is None else _to_float(value)
 
 
 def extract_speed(obj: Dict[str, Any]) -> Optional[float]:
@@ -184,10 +275,10 @@ def extract_speed(obj: Dict[str, Any]) -> Optional[float]:
     Returns:
         Speed in meters per second, or None if not found
     """
-    for key in ['speed', 'speed_mps', 'speedMps']:
-        if key in obj and obj[key] is not None:
-            return float(obj[key])
-    return None
+    value = obj.get('speed')
+    if value is None:
+        value = _first_value(obj, _SPEED_KEYS)
+    return None if value is None else _to_float(value)
 
 
 def extract_heading(obj: Dict[str, Any]) -> Optional[float]:
@@ -201,10 +292,10 @@ def extract_heading(obj: Dict[str, Any]) -> Optional[float]:
     Returns:
         Heading in degrees, or None if not found
     """
-    for key in ['heading', 'heading_deg', 'headingDeg']:
-        if key in obj and obj[key] is not None:
-            return float(obj[key])
-    return None
+    value = obj.get('heading')
+    if value is None:
+        value = _first_value(obj, _HEADING_KEYS)
+    return None if value is None else _to_float(value)
 
 
 def extract_message_type(obj: Dict[str, Any]) -> Optional[str]:
@@ -218,10 +309,10 @@ def extract_message_type(obj: Dict[str, Any]) -> Optional[str]:
     Returns:
         Message type (e.g., 'CAM', 'DENM'), or None if not found
     """
-    for key in ['messageType', 'message_type', 'msgType']:
-        if key in obj and obj[key] is not None:
-            return str(obj[key])
-    return None
+    value = obj.get('messageType')
+    if value is None:
+        value = _first_value(obj, _MESSAGE_TYPE_KEYS)
+    return None if value is None else str(value)
 
 
 def extract_direction(obj: Dict[str, Any]) -> Optional[Direction]:
@@ -237,11 +328,10 @@ def extract_direction(obj: Dict[str, Any]) -> Optional[Direction]:
     if direction_str is None:
         return None
 
-    try:
-        return Direction(direction_str)
-    except ValueError:
+    direction = _DIRECTION_MAP.get(direction_str) if isinstance(direction_str, str) else None
+    if direction is None:
         logger.warning(f"Invalid direction value: {direction_str}")
-        return None
+    return direction
 
 
 def extract_rsu_id(obj: Dict[str, Any]) -> Optional[str]:
@@ -255,10 +345,10 @@ def extract_rsu_id(obj: Dict[str, Any]) -> Optional[str]:
     Returns:
         RSU ID as string, or None if not found
     """
-    for key in ['rsu_id', 'rsuID', 'rsuId']:
-        if key in obj and obj[key] is not None:
-            return str(obj[key])
-    return None
+    value = obj.get('rsu_id')
+    if value is None:
+        value = _first_value(obj, _RSU_ID_KEYS)
+    return None if value is None else str(value)
 
 
 # ============================================================================
@@ -433,9 +523,9 @@ def parse_v2x_record(
 
     # Convert to int if present
     if payload_bytes is not None:
-        payload_bytes = int(payload_bytes)
+        payload_bytes = _to_int(payload_bytes)
     if frame_bytes is not None:
-        frame_bytes = int(frame_bytes)
+        frame_bytes = _to_int(frame_bytes)
 
     # Create record
     try:
@@ -463,6 +553,174 @@ def parse_v2x_record(
 # Batch Parsing
 # ============================================================================
 
+# Record fields produced by parse_records_batch, in model field order
+_GNSS_COLUMNS = (
+    'vehicle_id', 'timestamp_utc_ms', 'latitude_deg', 'longitude_deg',
+    'altitude_m', 'speed_mps', 'heading_deg', 'station_id', 'station_type',
+)
+_V2X_COLUMNS = (
+    'vehicle_id', 'station_id', 'station_type', 'timestamp_utc_ms',
+    'tx_timestamp_utc_ms', 'rx_timestamp_utc_ms', 'direction', 'rsu_id',
+    'message_type', 'payload_bytes', 'frame_bytes', 'latency_ms',
+)
+
+# Keys per batch field in priority order (canonical key first), and the
+# union of all of them: only these columns are pulled out of the objects
+_BATCH_FIELD_KEYS = {
+    'vehicle_id': ('stationID',) + _VEHICLE_ID_KEYS,
+    'station_id': ('stationID', 'station_id'),
+    'station_type': ('stationType',) + _STATION_TYPE_KEYS,
+    'timestamp': ('timestamp', 'timestamp_utc_ms'),
+    'latitude': ('latitude',) + _LATITUDE_KEYS,
+    'longitude': ('longitude',) + _LONGITUDE_KEYS,
+    'altitude': ('altitude',) + _ALTITUDE_KEYS,
+    'speed': ('speed',) + _SPEED_KEYS,
+    'heading': ('heading',) + _HEADING_KEYS,
+    'tx_timestamp': ('tx_timestamp', 'tx_timestamp_utc_ms'),
+    'rx_timestamp': ('rx_timestamp', 'rx_timestamp_utc_ms'),
+    'direction': ('direction',),
+    'rsu_id': ('rsu_id',) + _RSU_ID_KEYS,
+    'message_type': ('messageType',) + _MESSAGE_TYPE_KEYS,
+    'payload_bytes': ('payload_bytes',),
+    'frame_bytes': ('frame_bytes',),
+}
+_BATCH_KEYS = list(dict.fromkeys(chain.from_iterable(_BATCH_FIELD_KEYS.values())))
+
+
+def _coalesce(df: pd.DataFrame, keys: Tuple[str, ...]) -> pd.Series:
+    """First non-null value per row across the given columns."""
+    result = df[keys[0]]
+    for key in keys[1:]:
+        result = result.where(result.notna(), df[key])
+    return result
+
+
+def _to_str_column(values: pd.Series) -> pd.Series:
+    """Convert non-null values to str, keeping missing values as NaN."""
+    return values.map(str, na_action='ignore')
+
+
+def _to_float_column(values: pd.Series) -> pd.Series:
+    """Convert values to float64; missing or non-numeric values become NaN."""
+    return pd.to_numeric(values, errors='coerce').astype(np.float64)
+
+
+def _to_int_column(values: pd.Series) -> pd.Series:
+    """Convert values to nullable Int64, truncating floats like int()."""
+    numeric = pd.to_numeric(values, errors='coerce', dtype_backend='numpy_nullable')
+    if numeric.dtype.kind == 'f':
+        numeric = np.trunc(numeric)
+    return numeric.astype('Int64')
+
+
+def _normalize_timestamp_column(values: pd.Series, unit: Optional[str] = None) -> pd.Series:
+    """Vectorized normalize_timestamp over a column of raw timestamps.
+
+    The unit is auto-detected per value when not given. Missing or invalid
+    timestamps become <NA>.
+    """
+    ts = _to_int_column(values)
+    normalized = normalize_timestamp_array(ts.to_numpy(dtype=np.int64, na_value=0), unit)
+    return pd.Series(
+        pd.arrays.IntegerArray(normalized, ts.isna().to_numpy()), index=values.index
+    )
+
+
+def parse_records_batch(
+    objects: List[Dict[str, Any]],
+    timestamp_unit: Optional[str] = None
+) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """Parse a list of JSON objects into GNSS and V2X column frames.
+
+    Columnar equivalent of parse_gnss_record/parse_v2x_record: the objects
+    are loaded into one DataFrame, each field is coalesced across its naming
+    variants and converted once per column, and the GNSS/V2X subsets are
+    selected with boolean masks.
+
+    Args:
+        objects: List of JSON objects (dicts); other objects are skipped
+        timestamp_unit: Optional explicit timestamp unit
+                       If None, will auto-detect per value
+
+    Returns:
+        Tuple of (gnss_df, v2x_df) with columns named after the GnssRecord
+        and V2XMessageRecord fields; missing values are NaN / <NA>
+
+    Notes:
+        Like the per-record parsers, every object with a vehicle ID yields a
+        V2X row, and objects that also have a timestamp and coordinates
+        yield a GNSS row. Invalid numeric values are treated as missing.
+    """
+    dicts = []
+    for obj in objects:
+        if isinstance(obj, dict):
+            dicts.append(obj)
+        else:
+            logger.warning(f"Skipping non-dict object: {type(obj)}")
+
+    # Only the parsed keys become columns (other keys are never materialized);
+    # dtype=object keeps the raw JSON values (e.g. int IDs are not upcast to float)
+    df = pd.DataFrame(dicts, columns=_BATCH_KEYS, dtype=object)
+
+    vehicle_id = _to_str_column(_coalesce(df, _BATCH_FIELD_KEYS['vehicle_id']))
+    station_id = _to_str_column(_coalesce(df, _BATCH_FIELD_KEYS['station_id']))
+    station_type = _to_str_column(_coalesce(df, _BATCH_FIELD_KEYS['station_type']))
+    timestamp = _normalize_timestamp_column(
+        _coalesce(df, _BATCH_FIELD_KEYS['timestamp']), timestamp_unit
+    )
+
+    # GNSS: vehicle ID, timestamp and coordinates are required
+    latitude = _to_float_column(_coalesce(df, _BATCH_FIELD_KEYS['latitude']))
+    longitude = _to_float_column(_coalesce(df, _BATCH_FIELD_KEYS['longitude']))
+    gnss_mask = (
+        vehicle_id.notna() & timestamp.notna() & latitude.notna() & longitude.notna()
+    ).to_numpy(dtype=bool)
+
+    gnss_df = pd.DataFrame({
+        'vehicle_id': vehicle_id,
+        'timestamp_utc_ms': timestamp,
+        'latitude_deg': latitude,
+        'longitude_deg': longitude,
+        'altitude_m': _to_float_column(_coalesce(df, _BATCH_FIELD_KEYS['altitude'])),
+        'speed_mps': _to_float_column(_coalesce(df, _BATCH_FIELD_KEYS['speed'])),
+        'heading_deg': _to_float_column(_coalesce(df, _BATCH_FIELD_KEYS['heading'])),
+        'station_id': station_id,
+        'station_type': station_type,
+    }, columns=list(_GNSS_COLUMNS))[gnss_mask].reset_index(drop=True)
+    gnss_df['timestamp_utc_ms'] = gnss_df['timestamp_utc_ms'].astype(np.int64)
+
+    # V2X: only the vehicle ID is required
+    tx_timestamp = _normalize_timestamp_column(
+        _coalesce(df, _BATCH_FIELD_KEYS['tx_timestamp']), timestamp_unit
+    )
+    rx_timestamp = _normalize_timestamp_column(
+        _coalesce(df, _BATCH_FIELD_KEYS['rx_timestamp']), timestamp_unit
+    )
+
+    direction = _coalesce(df, _BATCH_FIELD_KEYS['direction'])
+    invalid = direction.notna() & ~direction.isin(list(_DIRECTION_MAP))
+    for value in direction[invalid].unique():
+        logger.warning(f"Invalid direction value: {value}")
+
+    v2x_mask = vehicle_id.notna().to_numpy(dtype=bool)
+    v2x_df = pd.DataFrame({
+        'vehicle_id': vehicle_id,
+        'station_id': station_id,
+        'station_type': station_type,
+        'timestamp_utc_ms': timestamp,
+        'tx_timestamp_utc_ms': tx_timestamp,
+        'rx_timestamp_utc_ms': rx_timestamp,
+        'direction': direction.where(~invalid),
+        'rsu_id': _to_str_column(_coalesce(df, _BATCH_FIELD_KEYS['rsu_id'])),
+        'message_type': _to_str_column(_coalesce(df, _BATCH_FIELD_KEYS['message_type'])),
+        'payload_bytes': _to_int_column(_coalesce(df, _BATCH_FIELD_KEYS['payload_bytes'])),
+        'frame_bytes': _to_int_column(_coalesce(df, _BATCH_FIELD_KEYS['frame_bytes'])),
+        'latency_ms': (rx_timestamp - tx_timestamp).astype(np.float64),
+    }, columns=list(_V2X_COLUMNS))[v2x_mask].reset_index(drop=True)
+
+    return gnss_df, v2x_df
+
+
 def parse_records(
     objects: List[Dict[str, Any]],
     source_file: Optional[Path] = None,
@@ -472,6 +730,8 @@ def parse_records(
 
     Automatically detects record type based on available fields.
     Objects with both GNSS and V2X fields will be parsed as both types.
+    For large inputs that do not need model instances, parse_records_batch
+    returns the same fields as DataFrames.
 
     Args:
         objects: List of JSON objects (dicts)
@@ -488,7 +748,7 @@ def parse_records(
         ... ]
         >>> gnss_records, v2x_records = parse_records(objects)
         >>> len(gnss_records), len(v2x_records)
-        (1, 1)
+        (1, 2)
     """
     gnss_records: List[GnssRecord] = []
     v2x_records: List[V2XMessageRecord] = []
@@ -514,3 +774,85 @@ def parse_records(
     )
 
     return gnss_records, v2x_records
+
+
+# ============================================================================
+# File Parsing
+# ============================================================================
+
+def _load_json(path: Path) -> Any:
+    """Decode a whole JSON file (with orjson when available)."""
+    if HAS_ORJSON:
+        with open(path, 'rb') as f:
+            return orjson.loads(f.read())
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def iter_object_batches(
+    path: Path,
+    batch_size: int = PARSE_BATCH_SIZE
+) -> Iterator[List[Any]]:
+    """Yield the objects of a JSON file in lists of at most batch_size.
+
+    Top-level arrays of at least STREAMING_THRESHOLD_BYTES are streamed
+    with ijson so only one batch is held in memory; other files are decoded
+    in one go. A top-level object is treated as a single record.
+
+    Args:
+        path: Path to JSON file
+        batch_size: Maximum number of objects per batch
+
+    Yields:
+        Lists of decoded objects, in file order
+    """
+    path = Path(path)
+    if HAS_IJSON and path.stat().st_size >= STREAMING_THRESHOLD_BYTES:
+        with open(path, 'rb') as f:
+            is_array = f.read(64).lstrip()[:1] == b'['
+            f.seek(0)
+            if is_array:
+                logger.debug(f"Streaming {path.name} with ijson")
+                objects = ijson.items(f, 'item', use_float=True)
+                while batch := list(islice(objects, batch_size)):
+                    yield batch
+                return
+
+    data = _load_json(path)
+    if not isinstance(data, list):
+        data = [data]
+    for start in range(0, len(data), batch_size):
+        yield data[start:start + batch_size]
+
+
+def parse_json_file(
+    path: Path,
+    timestamp_unit: Optional[str] = None,
+    batch_size: int = PARSE_BATCH_SIZE
+) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """Parse a JSON file of records into GNSS and V2X DataFrames.
+
+    Each batch from iter_object_batches is parsed column-wise by
+    parse_records_batch; no per-record models are built.
+
+    Args:
+        path: Path to a JSON file holding an array of objects (or one object)
+        timestamp_unit: Optional explicit timestamp unit
+        batch_size: Number of objects passed to parse_records_batch per call
+
+    Returns:
+        Tuple of (gnss_df, v2x_df) as returned by parse_records_batch
+    """
+    gnss_frames = []
+    v2x_frames = []
+    for objects in iter_object_batches(path, batch_size):
+        gnss_df, v2x_df = parse_records_batch(objects, timestamp_unit)
+        gnss_frames.append(gnss_df)
+        v2x_frames.append(v2x_df)
+
+    if not gnss_frames:
+        return parse_records_batch([], timestamp_unit)
+    return (
+        pd.concat(gnss_frames, ignore_index=True),
+        pd.concat(v2x_frames, ignore_index=True),
+    )
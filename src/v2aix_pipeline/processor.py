@@ -5,23 +5,101 @@ This module processes V2AIX JSON files to extract:
 1. Vehicle trajectories (position, speed, heading)
 2. V2X communication metrics (data volume, latency, message counts)
 3. Fused trajectory-communication data
+
+Records are held column-wise (TrajectoryColumns, V2XColumns, FusedColumns:
+one NumPy array per field) throughout the pipeline; the per-row dataclasses
+(TrajectoryPoint, V2XMessage, FusedData) describe the fields and are used
+when individual records are needed.
 """
 
 from __future__ import annotations
 
 import json
 import logging
+import os
+import re
+import sys
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
-from collections import defaultdict
-from dataclasses import dataclass, asdict
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, fields
+from operator import attrgetter
 import pandas as pd
 import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+# Optional orjson for faster whole-file JSON decoding
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+# Optional ijson for streaming very large files topic by topic
+try:
+    import ijson
+    HAS_IJSON = True
+except ImportError:
+    HAS_IJSON = False
 
 logger = logging.getLogger(__name__)
 
-
-@dataclass
+# Files at least this large are streamed topic by topic (requires ijson)
+STREAMING_THRESHOLD_BYTES = 256 * 1024 * 1024
+
+# V2X topics whose station IDs are used to infer a file's vehicle ID
+VEHICLE_ID_TOPICS = ('/v2x/cam', '/v2x/denm')
+
+# Topic classification (one scan of the topic name each)
+_GPS_TOPIC_RE = re.compile(r'/(?:gps|gnss|fix)')
+_V2X_TOPIC_RE = re.compile(r'/(?:v2x|cam|denm)')
+
+# Low-cardinality string columns stored as pandas categoricals (dictionary
+# encoded in Parquet)
+CATEGORICAL_COLUMNS = ('vehicle_id', 'topic', 'message_type')
+
+# Explicit dtypes for numeric record fields (optional floats: None -> NaN);
+# fields not listed here (other than categoricals) stay Python objects.
+# Per-message sizes and per-window counts fit in int32. Coordinates stay
+# float64: float32 keeps only ~7 significant digits, i.e. metre-level
+# steps at V2AIX latitudes/longitudes, which shows up as jitter in
+# trajectories sampled at 1 Hz.
+NUMERIC_COLUMN_DTYPES = {
+    'timestamp_ms': np.int64,
+    'latitude': np.float64,
+    'longitude': np.float64,
+    'altitude': np.float64,
+    'speed_mps': np.float64,
+    'heading_deg': np.float64,
+    'message_size_bytes': np.int32,
+    'latency_ms': np.float64,
+    'rssi_dbm': np.float64,
+    'messages_sent': np.int32,
+    'total_bytes_sent': np.int64,
+    'avg_latency_ms': np.float64,
+}
+
+# Parquet output settings: ZSTD gives noticeably smaller files than the
+# default snappy at comparable write speed
+PARQUET_COMPRESSION = 'zstd'
+PARQUET_COMPRESSION_LEVEL = 3
+
+# Rows buffered per Parquet row group when streaming output file by file
+PARQUET_ROW_GROUP_ROWS = 128 * 1024
+
+_PARQUET_WRITE_OPTIONS = {
+    'compression': PARQUET_COMPRESSION,
+    'compression_level': PARQUET_COMPRESSION_LEVEL,
+    'use_dictionary': True,
+    'data_page_version': '2.0',
+}
+
+# Slotted dataclasses (no per-instance __dict__) where supported
+_DATACLASS_OPTIONS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclass(**_DATACLASS_OPTIONS)
 class TrajectoryPoint:
     """Single trajectory point with position and kinematics."""
     timestamp_ms: int
@@ -34,7 +112,7 @@ class TrajectoryPoint:
     topic: str = ""
 
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class V2XMessage:
     """Single V2X message with communication metrics."""
     timestamp_ms: int
@@ -50,7 +128,7 @@ class V2XMessage:
     topic: str = ""
 
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class FusedData:
     """Fused trajectory and V2X communication data."""
     timestamp_ms: int
@@ -67,51 +145,199 @@ class FusedData:
     message_types: str = ""
 
 
-def infer_vehicle_id_from_data(data: Dict[str, Any]) -> str:
-    """
-    从JSON数据中推断主要的车辆ID
+def _object_array(values: Any, n: int) -> np.ndarray:
+    """Build a 1-D object array (NumPy would otherwise infer a str dtype)."""
+    arr = np.empty(n, dtype=object)
+    arr[:] = list(values)
+    return arr
 
-    策略:
-    - 统计所有V2X消息中的station_id
-    - 如果某个ID占比>80%,认为是单车文件
-    - 否则返回"unknown" (多车混合)
 
-    Args:
-        data: JSON数据字典
+class _ColumnBatch:
+    """Structure-of-arrays batch of records: one NumPy array per field.
 
-    Returns:
-        推断的车辆ID,如果无法确定则返回"unknown"
+    Numeric fields use NUMERIC_COLUMN_DTYPES (missing optional floats are
+    NaN); string fields are object arrays. Subclasses are dataclasses whose
+    fields mirror the row dataclass given by ``record_type``.
     """
-    from collections import Counter
 
+    record_type: type
+
+    def __len__(self) -> int:
+        return len(self.timestamp_ms)
+
+    @classmethod
+    def from_records(cls, records: List[Any]):
+        """Build a batch from a list of row dataclass instances."""
+        n = len(records)
+        columns = {}
+        for field in fields(cls):
+            name = field.name
+            values = map(attrgetter(name), records)
+            dtype = NUMERIC_COLUMN_DTYPES.get(name)
+            if dtype is np.float64:
+                columns[name] = np.fromiter(
+                    (np.nan if v is None else v for v in values), dtype=dtype, count=n
+                )
+            elif dtype is not None:
+                columns[name] = np.fromiter(values, dtype=dtype, count=n)
+            else:
+                columns[name] = _object_array(values, n)
+        return cls(**columns)
+
+    @classmethod
+    def empty(cls):
+        """Batch with zero records."""
+        return cls.from_records([])
+
+    @classmethod
+    def concat(cls, batches: List[Any]):
+        """Concatenate batches into one (empty batch if none given)."""
+        batches = list(batches)
+        if not batches:
+            return cls.empty()
+        if len(batches) == 1:
+            return batches[0]
+        return cls(**{
+            field.name: np.concatenate([getattr(b, field.name) for b in batches])
+            for field in fields(cls)
+        })
+
+    def take(self, indices: np.ndarray):
+        """Select/reorder records by integer index array or boolean mask."""
+        return type(self)(**{
+            field.name: getattr(self, field.name)[indices] for field in fields(self)
+        })
+
+    def to_frame(self) -> pd.DataFrame:
+        """Convert to a DataFrame; CATEGORICAL_COLUMNS become categoricals."""
+        columns = {}
+        for field in fields(self):
+            values = getattr(self, field.name)
+            if field.name in CATEGORICAL_COLUMNS:
+                values = pd.Categorical(values)
+            columns[field.name] = values
+        return pd.DataFrame(columns)
+
+    @classmethod
+    def arrow_schema(cls) -> pa.Schema:
+        """Arrow schema matching to_arrow(); CATEGORICAL_COLUMNS are dictionary-encoded."""
+        arrow_fields = []
+        for field in fields(cls):
+            dtype = NUMERIC_COLUMN_DTYPES.get(field.name)
+            if dtype is not None:
+                arrow_type = pa.from_numpy_dtype(dtype)
+            elif field.name in CATEGORICAL_COLUMNS:
+                arrow_type = pa.dictionary(pa.int32(), pa.string())
+            else:
+                arrow_type = pa.string()
+            arrow_fields.append(pa.field(field.name, arrow_type))
+        return pa.schema(arrow_fields)
+
+    def to_arrow(self) -> pa.RecordBatch:
+        """Convert to an Arrow record batch (NaN and None become nulls)."""
+        arrays = []
+        for field in fields(self):
+            values = getattr(self, field.name)
+            dtype = NUMERIC_COLUMN_DTYPES.get(field.name)
+            if dtype is not None:
+                array = pa.array(values, type=pa.from_numpy_dtype(dtype), from_pandas=True)
+            else:
+                array = pa.array(values, type=pa.string(), from_pandas=True)
+                if field.name in CATEGORICAL_COLUMNS:
+                    array = array.dictionary_encode()
+            arrays.append(array)
+        return pa.RecordBatch.from_arrays(arrays, schema=self.arrow_schema())
+
+    def to_records(self) -> List[Any]:
+        """Convert to a list of row dataclass instances (NaN -> None)."""
+        columns = []
+        for field in fields(self):
+            values = getattr(self, field.name).tolist()
+            if NUMERIC_COLUMN_DTYPES.get(field.name) is np.float64:
+                values = [None if v != v else v for v in values]
+            columns.append(values)
+        return [self.record_type(*row) for row in zip(*columns)]
+
+
+@dataclass(eq=False)
+class TrajectoryColumns(_ColumnBatch):
+    """Column-oriented batch of trajectory points (see TrajectoryPoint)."""
+    record_type = TrajectoryPoint
+
+    timestamp_ms: np.ndarray
+    vehicle_id: np.ndarray
+    latitude: np.ndarray
+    longitude: np.ndarray
+    altitude: np.ndarray
+    speed_mps: np.ndarray
+    heading_deg: np.ndarray
+    topic: np.ndarray
+
+
+@dataclass(eq=False)
+class V2XColumns(_ColumnBatch):
+    """Column-oriented batch of V2X messages (see V2XMessage)."""
+    record_type = V2XMessage
+
+    timestamp_ms: np.ndarray
+    vehicle_id: np.ndarray
+    message_type: np.ndarray
+    message_size_bytes: np.ndarray
+    sender_id: np.ndarray
+    receiver_id: np.ndarray
+    latency_ms: np.ndarray
+    rssi_dbm: np.ndarray
+    topic: np.ndarray
+
+
+@dataclass(eq=False)
+class FusedColumns(_ColumnBatch):
+    """Column-oriented batch of fused records (see FusedData)."""
+    record_type = FusedData
+
+    timestamp_ms: np.ndarray
+    vehicle_id: np.ndarray
+    latitude: np.ndarray
+    longitude: np.ndarray
+    altitude: np.ndarray
+    speed_mps: np.ndarray
+    heading_deg: np.ndarray
+    messages_sent: np.ndarray
+    total_bytes_sent: np.ndarray
+    avg_latency_ms: np.ndarray
+    message_types: np.ndarray
+
+
+def _collect_station_ids(records: Any) -> List[Any]:
+    """收集V2X记录中header.station_id.value的非空值"""
     station_ids = []
+    if not isinstance(records, list):
+        return station_ids
 
-    # 从V2X消息中收集station_id
-    for topic in ['/v2x/cam', '/v2x/denm']:
-        if topic not in data:
+    for record in records:
+        if not isinstance(record, dict):
             continue
 
-        records = data[topic]
-        if not isinstance(records, list):
+        msg = record.get('message', {})
+        if not isinstance(msg, dict):
             continue
 
-        for record in records:
-            if not isinstance(record, dict):
-                continue
+        header = msg.get('header', {})
+        if not isinstance(header, dict):
+            continue
 
-            msg = record.get('message', {})
-            if not isinstance(msg, dict):
-                continue
+        station_id_obj = header.get('station_id', {})
+        if isinstance(station_id_obj, dict):
+            sid = station_id_obj.get('value')
+            if sid:
+                station_ids.append(sid)
 
-            header = msg.get('header', {})
-            if not isinstance(header, dict):
-                continue
+    return station_ids
 
-            station_id_obj = header.get('station_id', {})
-            if isinstance(station_id_obj, dict):
-                sid = station_id_obj.get('value')
-                if sid:
-                    station_ids.append(sid)
+
+def _majority_vehicle_id(station_ids: List[Any]) -> str:
+    """如果某个station_id占比>80%则返回它,否则返回"unknown" """
+    from collections import Counter
 
     if not station_ids:
         return "unknown"
@@ -129,24 +355,65 @@ def infer_vehicle_id_from_data(data: Dict[str, Any]) -> str:
     return "unknown"
 
 
-def extract_trajectory_from_topic(data: Dict[str, Any], topic: str, vehicle_id: str = "unknown") -> List[TrajectoryPoint]:
+def infer_vehicle_id_from_data(data: Dict[str, Any]) -> str:
+    """
+    从JSON数据中推断主要的车辆ID
+
+    策略:
+    - 统计所有V2X消息中的station_id
+    - 如果某个ID占比>80%,认为是单车文件
+    - 否则返回"unknown" (多车混合)
+
+    Args:
+        data: JSON数据字典
+
+    Returns:
+        推断的车辆ID,如果无法确定则返回"unknown"
+    """
+    station_ids = []
+
+    # 从V2X消息中收集station_id
+    for topic in VEHICLE_ID_TOPICS:
+        station_ids.extend(_collect_station_ids(data.get(topic)))
+
+    return _majority_vehicle_id(station_ids)
+
+
+def _message_size(message: Dict[str, Any]) -> int:
+    """Approximate a message's size as its compact UTF-8 JSON length in bytes."""
+    if HAS_ORJSON:
+        try:
+            return len(orjson.dumps(message))
+        except orjson.JSONEncodeError:
+            pass  # e.g. integers beyond 64 bit; fall back to stdlib
+    return len(json.dumps(message, separators=(',', ':'), ensure_ascii=False).encode('utf-8'))
+
+
+def extract_trajectory_from_topic(records: List[Dict[str, Any]], topic: str, vehicle_id: str = "unknown") -> TrajectoryColumns:
     """Extract trajectory points from a GPS topic.
 
     Args:
-        data: Full JSON data dict
+        records: Records of the topic (the list stored under the topic key)
         topic: Topic name (e.g., '/gps/cohda_mk5/fix')
+        vehicle_id: Vehicle ID assigned to all points
 
     Returns:
-        List of TrajectoryPoint objects
+        TrajectoryColumns with one entry per valid record
     """
-    trajectories = []
+    if not isinstance(records, list):
+        return TrajectoryColumns.empty()
 
-    if topic not in data:
-        return trajectories
+    # Share one string object per topic/vehicle across all points
+    topic = sys.intern(topic)
+    vehicle_id = sys.intern(vehicle_id)
 
-    records = data[topic]
-    if not isinstance(records, list):
-        return trajectories
+    # Buffers sized for every record, truncated to the valid count below
+    n = len(records)
+    timestamps = np.empty(n, dtype=np.int64)
+    lats = np.empty(n, dtype=np.float64)
+    lons = np.empty(n, dtype=np.float64)
+    alts = np.empty(n, dtype=np.float64)
+    count = 0
 
     for record in records:
         if not isinstance(record, dict):
@@ -156,7 +423,6 @@ def extract_trajectory_from_topic(data: Dict[str, Any], topic: str, vehicle_id:
         timestamp_ns = record.get('recording_timestamp_nsec')
         if timestamp_ns is None:
             continue
-        timestamp_ms = int(timestamp_ns / 1_000_000)
 
         # Extract message content
         message = record.get('message', {})
@@ -171,52 +437,66 @@ def extract_trajectory_from_topic(data: Dict[str, Any], topic: str, vehicle_id:
 
         alt = message.get('altitude')
 
-        # Extract speed (from header stamp or direct field)
-        speed = None
-        header = message.get('header', {})
-        if isinstance(header, dict):
-            stamp = header.get('stamp', {})
-            # Note: speed might be in a different field, this is a placeholder
-
-        # Extract heading (might be in orientation or separate field)
-        heading = None
-
-        # Use provided vehicle_id instead of hardcoded "unknown"
-        # vehicle_id parameter should be inferred from V2X messages in the same file
-
-        point = TrajectoryPoint(
-            timestamp_ms=timestamp_ms,
-            vehicle_id=vehicle_id,
-            latitude=lat,
-            longitude=lon,
-            altitude=alt,
-            speed_mps=speed,
-            heading_deg=heading,
-            topic=topic
-        )
-        trajectories.append(point)
-
-    return trajectories
-
-
-def extract_v2x_from_topic(data: Dict[str, Any], topic: str) -> List[V2XMessage]:
+        # Speed and heading are not available in the GPS fix messages
+
+        timestamps[count] = timestamp_ns // 1_000_000
+        lats[count] = lat
+        lons[count] = lon
+        alts[count] = np.nan if alt is None else alt
+        count += 1
+
+    # Use provided vehicle_id instead of hardcoded "unknown"
+    # vehicle_id parameter should be inferred from V2X messages in the same file
+    return TrajectoryColumns(
+        timestamp_ms=timestamps[:count],
+        vehicle_id=np.full(count, vehicle_id, dtype=object),
+        latitude=lats[:count],
+        longitude=lons[:count],
+        altitude=alts[:count],
+        speed_mps=np.full(count, np.nan),
+        heading_deg=np.full(count, np.nan),
+        topic=np.full(count, topic, dtype=object)
+    )
+
+
+def _topic_message_type(topic: str) -> Optional[str]:
+    """Message type implied by the topic name, or None if the topic doesn't name one."""
+    topic = topic.lower()
+    if 'cam' in topic:
+        return "CAM"
+    if 'denm' in topic:
+        return "DENM"
+    return None
+
+
+def extract_v2x_from_topic(records: List[Dict[str, Any]], topic: str) -> V2XColumns:
     """Extract V2X messages from a V2X topic.
 
     Args:
-        data: Full JSON data dict
+        records: Records of the topic (the list stored under the topic key)
         topic: Topic name (e.g., '/v2x/cam', '/v2x/denm')
 
     Returns:
-        List of V2XMessage objects
+        V2XColumns with one entry per valid record
     """
-    messages = []
+    if not isinstance(records, list):
+        return V2XColumns.empty()
 
-    if topic not in data:
-        return messages
+    topic = sys.intern(topic)
 
-    records = data[topic]
-    if not isinstance(records, list):
-        return messages
+    # Topics such as /v2x/cam carry a single message type, decided once here;
+    # other topics (e.g. /v2x/raw) are classified per record
+    topic_message_type = _topic_message_type(topic)
+
+    # Buffers sized for every record, truncated to the valid count below
+    n = len(records)
+    timestamps = np.empty(n, dtype=np.int64)
+    vehicle_ids = np.empty(n, dtype=object)
+    message_types = np.empty(n if topic_message_type is None else 0, dtype=object)
+    sizes = np.empty(n, dtype=NUMERIC_COLUMN_DTYPES['message_size_bytes'])
+    sender_ids = np.empty(n, dtype=object)
+    receiver_ids = np.empty(n, dtype=object)
+    count = 0
 
     for record in records:
         if not isinstance(record, dict):
@@ -226,7 +506,7 @@ def extract_v2x_from_topic(data: Dict[str, Any], topic: str) -> List[V2XMessage]
         timestamp_ns = record.get('recording_timestamp_nsec')
         if timestamp_ns is None:
             continue
-        timestamp_ms = int(timestamp_ns / 1_000_000)
+        timestamp_ms = timestamp_ns // 1_000_000
 
         # Extract message content
         message = record.get('message', {})
@@ -234,11 +514,13 @@ def extract_v2x_from_topic(data: Dict[str, Any], topic: str) -> List[V2XMessage]
             continue
 
         # Determine message type
-        message_type = "UNKNOWN"
-        if 'cam' in message:
-            message_type = "CAM"
-        elif 'denm' in message:
-            message_type = "DENM"
+        if topic_message_type is None:
+            message_type = "UNKNOWN"
+            if 'cam' in message:
+                message_type = "CAM"
+            elif 'denm' in message:
+                message_type = "DENM"
+            message_types[count] = message_type
 
         # Extract sender ID (vehicle/station ID from message header)
         sender_id = "unknown"
@@ -249,8 +531,8 @@ def extract_v2x_from_topic(data: Dict[str, Any], topic: str) -> List[V2XMessage]
             if isinstance(station_id_obj, dict):
                 sid = station_id_obj.get('value')
                 if sid:
-                    sender_id = str(sid)
-                    vehicle_id = str(sid)
+                    sender_id = sys.intern(str(sid))
+                    vehicle_id = sender_id
 
         # Extract receiver ID
         # For ROS messages, receiver might be indicated by frame_id or address
@@ -277,143 +559,308 @@ def extract_v2x_from_topic(data: Dict[str, Any], topic: str) -> List[V2XMessage]
                     receiver_id = str(addr_value)
 
         # Calculate message size (approximate from JSON serialization)
-        message_size = len(json.dumps(message))
+        message_size = _message_size(message)
+
+        # Latency (tx/rx difference) and RSSI are not available in the
+        # recorded messages; their columns stay NaN
 
-        # Extract latency (if available - difference between tx and rx)
-        latency = None
+        timestamps[count] = timestamp_ms
+        vehicle_ids[count] = vehicle_id
+        sizes[count] = message_size
+        sender_ids[count] = sender_id
+        receiver_ids[count] = receiver_id
+        count += 1
 
-        # Extract RSSI (if available)
-        rssi = None
+    if topic_message_type is not None:
+        message_types = np.full(count, topic_message_type, dtype=object)
 
-        msg = V2XMessage(
-            timestamp_ms=timestamp_ms,
-            vehicle_id=vehicle_id,
-            message_type=message_type,
-            message_size_bytes=message_size,
-            sender_id=sender_id,
-            receiver_id=receiver_id,
-            latency_ms=latency,
-            rssi_dbm=rssi,
-            topic=topic
-        )
-        messages.append(msg)
+    return V2XColumns(
+        timestamp_ms=timestamps[:count],
+        vehicle_id=vehicle_ids[:count],
+        message_type=message_types[:count],
+        message_size_bytes=sizes[:count],
+        sender_id=sender_ids[:count],
+        receiver_id=receiver_ids[:count],
+        latency_ms=np.full(count, np.nan),
+        rssi_dbm=np.full(count, np.nan),
+        topic=np.full(count, topic, dtype=object)
+    )
 
-    return messages
 
+def _iter_topics(json_path: Path) -> Iterator[Tuple[str, Any]]:
+    """Yield (topic, records) pairs from a V2AIX topic-based JSON file.
 
-def process_json_file(json_path: Path) -> Tuple[List[TrajectoryPoint], List[V2XMessage]]:
+    Files of at least STREAMING_THRESHOLD_BYTES are streamed with ijson so
+    only one topic is held in memory at a time; smaller files are decoded
+    in one go (with orjson when available).
+
+    Args:
+        json_path: Path to JSON file
+
+    Yields:
+        (topic, records) for each top-level key of the JSON object
+    """
+    if HAS_IJSON and json_path.stat().st_size >= STREAMING_THRESHOLD_BYTES:
+        logger.debug(f"Streaming {json_path.name} with ijson")
+        with open(json_path, 'rb') as f:
+            yield from ijson.kvitems(f, '', use_float=True)
+        return
+
+    if HAS_ORJSON:
+        with open(json_path, 'rb') as f:
+            data = orjson.loads(f.read())
+    else:
+        with open(json_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+
+    if not isinstance(data, dict):
+        logger.warning(f"Unexpected JSON structure in {json_path.name}")
+        return
+
+    yield from data.items()
+
+
+def process_json_file(json_path: Path) -> Tuple[TrajectoryColumns, V2XColumns]:
     """Process a single JSON file to extract trajectories and V2X messages.
 
     Args:
         json_path: Path to JSON file
 
     Returns:
-        Tuple of (trajectory_points, v2x_messages)
+        Tuple of (trajectory_points, v2x_messages) column batches
     """
     trajectories = []
     v2x_messages = []
 
     try:
-        with open(json_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        # V2X topics are extracted as they are read. GPS records are kept
+        # until all station IDs are seen, since their vehicle ID is inferred
+        # from the file's V2X messages.
+        station_ids = []
+        gps_topics = []
 
-        if not isinstance(data, dict):
-            logger.warning(f"Unexpected JSON structure in {json_path.name}")
-            return trajectories, v2x_messages
-
-        # Step 1: Infer vehicle ID from V2X messages in this file
-        inferred_vehicle_id = infer_vehicle_id_from_data(data)
-        if inferred_vehicle_id != "unknown":
-            logger.debug(f"{json_path.name}: Inferred vehicle_id = {inferred_vehicle_id}")
-
-        # Process each topic
-        for topic, records in data.items():
+        for topic, records in _iter_topics(json_path):
             if not isinstance(topic, str) or not topic.startswith('/'):
                 continue
 
-            # GPS topics - use inferred vehicle_id
-            if '/gps' in topic or '/gnss' in topic or '/fix' in topic:
-                traj = extract_trajectory_from_topic(data, topic, inferred_vehicle_id)
-                trajectories.extend(traj)
-                logger.debug(f"Extracted {len(traj)} trajectory points from {topic}")
+            if topic in VEHICLE_ID_TOPICS:
+                station_ids.extend(_collect_station_ids(records))
+
+            # GPS topics - extracted below with the inferred vehicle_id
+            if _GPS_TOPIC_RE.search(topic):
+                gps_topics.append((topic, records))
 
             # V2X topics
-            elif '/v2x' in topic or '/cam' in topic or '/denm' in topic:
-                msgs = extract_v2x_from_topic(data, topic)
-                v2x_messages.extend(msgs)
+            elif _V2X_TOPIC_RE.search(topic):
+                msgs = extract_v2x_from_topic(records, topic)
+                v2x_messages.append(msgs)
                 logger.debug(f"Extracted {len(msgs)} V2X messages from {topic}")
 
+        # Infer vehicle ID from V2X messages in this file
+        inferred_vehicle_id = _majority_vehicle_id(station_ids)
+        if inferred_vehicle_id != "unknown":
+            logger.debug(f"{json_path.name}: Inferred vehicle_id = {inferred_vehicle_id}")
+
+        for topic, records in gps_topics:
+            traj = extract_trajectory_from_topic(records, topic, inferred_vehicle_id)
+            trajectories.append(traj)
+            logger.debug(f"Extracted {len(traj)} trajectory points from {topic}")
+
     except Exception as e:
         logger.error(f"Error processing {json_path}: {e}")
 
-    return trajectories, v2x_messages
+    return TrajectoryColumns.concat(trajectories), V2XColumns.concat(v2x_messages)
 
 
 def fuse_trajectory_and_v2x(
-    trajectories: List[TrajectoryPoint],
-    v2x_messages: List[V2XMessage],
+    trajectories: TrajectoryColumns,
+    v2x_messages: V2XColumns,
     time_window_ms: int = 1000
-) -> List[FusedData]:
+) -> FusedColumns:
     """Fuse trajectory and V2X data by timestamp.
 
     Args:
-        trajectories: List of trajectory points
-        v2x_messages: List of V2X messages
+        trajectories: Trajectory points
+        v2x_messages: V2X messages
         time_window_ms: Time window for fusion (default 1000ms = 1Hz)
 
     Returns:
-        List of FusedData objects
+        FusedColumns, one entry per trajectory point (sorted by timestamp)
     """
-    if not trajectories:
-        return []
+    if len(trajectories) == 0:
+        return FusedColumns.empty()
 
     # Sort by timestamp
-    trajectories = sorted(trajectories, key=lambda x: x.timestamp_ms)
-    v2x_messages = sorted(v2x_messages, key=lambda x: x.timestamp_ms)
-
-    # Group V2X messages by vehicle and time window
-    v2x_by_vehicle = defaultdict(list)
-    for msg in v2x_messages:
-        v2x_by_vehicle[msg.vehicle_id].append(msg)
-
-    fused = []
-
-    # For each trajectory point, find matching V2X messages
-    for traj in trajectories:
-        # Find V2X messages in time window
-        window_start = traj.timestamp_ms - time_window_ms // 2
-        window_end = traj.timestamp_ms + time_window_ms // 2
-
-        matching_msgs = [
-            msg for msg in v2x_by_vehicle.get(traj.vehicle_id, [])
-            if window_start <= msg.timestamp_ms <= window_end
-        ]
-
-        # Compute V2X metrics
-        messages_sent = len(matching_msgs)
-        total_bytes = sum(msg.message_size_bytes for msg in matching_msgs)
-
-        latencies = [msg.latency_ms for msg in matching_msgs if msg.latency_ms is not None]
-        avg_latency = np.mean(latencies) if latencies else None
-
-        message_types = ','.join(sorted(set(msg.message_type for msg in matching_msgs)))
-
-        fused_point = FusedData(
-            timestamp_ms=traj.timestamp_ms,
-            vehicle_id=traj.vehicle_id,
-            latitude=traj.latitude,
-            longitude=traj.longitude,
-            altitude=traj.altitude,
-            speed_mps=traj.speed_mps,
-            heading_deg=traj.heading_deg,
-            messages_sent=messages_sent,
-            total_bytes_sent=total_bytes,
-            avg_latency_ms=avg_latency,
-            message_types=message_types
-        )
-        fused.append(fused_point)
-
-    return fused
+    trajectories = trajectories.take(np.argsort(trajectories.timestamp_ms, kind='stable'))
+
+    # Order V2X messages by (vehicle, timestamp) so each vehicle's messages
+    # form one contiguous, time-sorted run
+    v2x_codes, v2x_vehicles = pd.factorize(v2x_messages.vehicle_id)
+    v2x_messages = v2x_messages.take(
+        np.lexsort((v2x_messages.timestamp_ms, v2x_codes))
+    )
+    v2x_codes = np.sort(v2x_codes)
+    run_starts = np.searchsorted(v2x_codes, np.arange(len(v2x_vehicles)), side='left')
+    run_ends = np.searchsorted(v2x_codes, np.arange(len(v2x_vehicles)), side='right')
+    v2x_runs = {
+        vehicle_id: (start, end)
+        for vehicle_id, start, end in zip(v2x_vehicles, run_starts.tolist(), run_ends.tolist())
+    }
+
+    # Prefix sums over the (vehicle, time)-ordered messages: any window's
+    # count, bytes, latency mean and per-type presence is cumsum[hi] - cumsum[lo].
+    # Message types are coded against the sorted global type list, and a
+    # window's type set is kept as a bitmask over those codes.
+    v2x_ts = v2x_messages.timestamp_ms
+    v2x_lat = v2x_messages.latency_ms
+    has_lat = ~np.isnan(v2x_lat)
+    bytes_cs = np.concatenate(([0], np.cumsum(v2x_messages.message_size_bytes, dtype=np.int64)))
+    lat_cs = np.concatenate(([0.0], np.cumsum(np.where(has_lat, v2x_lat, 0.0))))
+    cnt_cs = np.concatenate(([0], np.cumsum(has_lat.astype(np.int64))))
+
+    type_names, v2x_type = np.unique(v2x_messages.message_type, return_inverse=True)
+    type_cs = [
+        np.concatenate(([0], np.cumsum(v2x_type == code)))
+        for code in range(len(type_names))
+    ]
+
+    # Window bounds (absolute indices into the ordered messages) per
+    # trajectory point, found per vehicle with searchsorted
+    n_traj = len(trajectories)
+    lo = np.zeros(n_traj, dtype=np.int64)
+    hi = np.zeros(n_traj, dtype=np.int64)
+
+    half_window = time_window_ms // 2
+    traj_codes, traj_vehicles = pd.factorize(trajectories.vehicle_id)
+    for code, vehicle_id in enumerate(traj_vehicles):
+        run = v2x_runs.get(vehicle_id)
+        if run is None:
+            continue
+
+        start, end = run
+        idx = np.flatnonzero(traj_codes == code)
+        ts = trajectories.timestamp_ms[idx]
+        vehicle_ts = v2x_ts[start:end]
+        lo[idx] = start + np.searchsorted(vehicle_ts, ts - half_window, side='left')
+        hi[idx] = start + np.searchsorted(vehicle_ts, ts + half_window, side='right')
+
+    n_lat = cnt_cs[hi] - cnt_cs[lo]
+    avg_latencies = np.where(
+        n_lat > 0,
+        (lat_cs[hi] - lat_cs[lo]) / np.where(n_lat > 0, n_lat, 1),
+        np.nan
+    )
+
+    type_masks = np.zeros(n_traj, dtype=np.int64)
+    for code, cs in enumerate(type_cs):
+        type_masks |= ((cs[hi] - cs[lo]) > 0).astype(np.int64) << code
+
+    # Decode each distinct bitmask to its comma-joined type list once
+    unique_masks, mask_index = np.unique(type_masks, return_inverse=True)
+    type_strings = _object_array(
+        (
+            ','.join(name for code, name in enumerate(type_names) if mask >> code & 1)
+            for mask in unique_masks.tolist()
+        ),
+        len(unique_masks)
+    )
+
+    return FusedColumns(
+        timestamp_ms=trajectories.timestamp_ms,
+        vehicle_id=trajectories.vehicle_id,
+        latitude=trajectories.latitude,
+        longitude=trajectories.longitude,
+        altitude=trajectories.altitude,
+        speed_mps=trajectories.speed_mps,
+        heading_deg=trajectories.heading_deg,
+        messages_sent=(hi - lo).astype(NUMERIC_COLUMN_DTYPES['messages_sent']),
+        total_bytes_sent=bytes_cs[hi] - bytes_cs[lo],
+        avg_latency_ms=avg_latencies,
+        message_types=type_strings[mask_index.reshape(-1)]
+    )
+
+
+class _OutputSink:
+    """Appends column batches to one output file as they are produced.
+
+    Parquet output goes through a ParquetWriter, buffering batches until a
+    row group of PARQUET_ROW_GROUP_ROWS rows is ready; CSV output is
+    appended batch by batch. Nothing is held beyond the current row group.
+    """
+
+    def __init__(self, path: Path, batch_type: type, output_format: str = 'parquet'):
+        self.path = path
+        self.batch_type = batch_type
+        self.output_format = output_format
+        self._pending = []
+        self._pending_rows = 0
+        self._rows_written = 0
+        self._writer = None
+        if output_format == 'parquet':
+            self._writer = pq.ParquetWriter(
+                path, batch_type.arrow_schema(), **_PARQUET_WRITE_OPTIONS
+            )
+
+    def write(self, batch: _ColumnBatch) -> None:
+        """Append a batch of records."""
+        if len(batch) == 0:
+            return
+
+        if self._writer is None:
+            batch.to_frame().to_csv(
+                self.path, mode='a' if self._rows_written else 'w',
+                header=not self._rows_written, index=False
+            )
+            self._rows_written += len(batch)
+            return
+
+        self._pending.append(batch.to_arrow())
+        self._pending_rows += len(batch)
+        if self._pending_rows >= PARQUET_ROW_GROUP_ROWS:
+            self._flush()
+
+    def _flush(self) -> None:
+        if self._pending:
+            table = pa.Table.from_batches(self._pending)
+            self._writer.write_table(table, row_group_size=PARQUET_ROW_GROUP_ROWS)
+            self._rows_written += self._pending_rows
+            self._pending = []
+            self._pending_rows = 0
+
+    def close(self) -> None:
+        """Flush buffered rows and finalize the file."""
+        if self._writer is not None:
+            self._flush()
+            self._writer.close()
+        elif not self._rows_written:
+            # Header-only CSV for empty output
+            self.batch_type.empty().to_frame().to_csv(self.path, index=False)
+
+
+def iter_scenario_files(input_dir: Path) -> Iterator[Path]:
+    """
+    遍历input_dir下所有scenarios目录中的JSON文件
+
+    使用os.scandir递归遍历,只依赖目录项自带的类型信息,不对每个文件调用stat。
+
+    Args:
+        input_dir: 输入根目录
+
+    Yields:
+        JSON文件路径(按遍历顺序,未排序)
+    """
+    stack = [(os.fspath(input_dir), False)]
+    while stack:
+        dir_path, in_scenarios = stack.pop()
+        try:
+            with os.scandir(dir_path) as it:
+                for entry in it:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append((entry.path, entry.name == 'scenarios'))
+                    elif in_scenarios and entry.name.endswith('.json'):
+                        yield Path(entry.path)
+        except OSError as e:
+            logger.debug(f"Skipping unreadable directory {dir_path}: {e}")
 
 
 def find_scenario_files(input_dir: Path, scenario_dirs: list = None) -> list:
@@ -432,7 +879,7 @@ def find_scenario_files(input_dir: Path, scenario_dirs: list = None) -> list:
 
     if scenario_dirs is None:
         # 查找所有scenarios目录
-        json_files = list(input_dir.rglob("scenarios/*.json"))
+        json_files = list(iter_scenario_files(input_dir))
     else:
         # 只查找指定的scenarios目录
         for scenario_dir in scenario_dirs:
@@ -451,7 +898,8 @@ def process_dataset(
     input_dir: Path,
     output_dir: Path,
     output_format: str = 'parquet',
-    scenario_dirs: list = None
+    scenario_dirs: list = None,
+    workers: Optional[int] = None
 ) -> Dict[str, Any]:
     """Process entire dataset to extract trajectories and V2X metrics.
 
@@ -461,6 +909,8 @@ def process_dataset(
         output_format: Output format ('parquet' or 'csv')
         scenario_dirs: List of scenario directories to process (relative to input_dir)
                       If None, process all scenarios directories
+        workers: Number of worker processes for parsing files
+                 (default: CPU count; 1 processes files in this process)
 
     Returns:
         Summary statistics
@@ -476,49 +926,70 @@ def process_dataset(
     all_trajectories = []
     all_v2x_messages = []
 
-    # Process each file
-    for i, json_path in enumerate(json_files, 1):
-        if i % 100 == 0:
-            logger.info(f"Processing file {i}/{len(json_files)}: {json_path.name}")
+    if workers is None:
+        workers = os.cpu_count() or 1
+    workers = min(workers, len(json_files)) or 1
+
+    # Trajectories and V2X messages are written out file by file; only the
+    # column batches needed for fusion are kept in memory.
+    extension = 'parquet' if output_format == 'parquet' else 'csv'
+    traj_sink = _OutputSink(output_dir / f'trajectories.{extension}', TrajectoryColumns, output_format)
+    v2x_sink = _OutputSink(output_dir / f'v2x_messages.{extension}', V2XColumns, output_format)
 
-        traj, msgs = process_json_file(json_path)
-        all_trajectories.extend(traj)
-        all_v2x_messages.extend(msgs)
+    # Process files, in parallel worker processes if requested. Results come
+    # back in file order; small chunks keep workers balanced because file
+    # sizes vary a lot.
+    executor = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+    try:
+        if executor is not None:
+            chunksize = min(4, max(1, len(json_files) // (workers * 4)))
+            results = executor.map(process_json_file, json_files, chunksize=chunksize)
+        else:
+            results = map(process_json_file, json_files)
+
+        for i, (json_path, (traj, msgs)) in enumerate(zip(json_files, results), 1):
+            if i % 100 == 0:
+                logger.info(f"Processed file {i}/{len(json_files)}: {json_path.name}")
+
+            traj_sink.write(traj)
+            v2x_sink.write(msgs)
+            all_trajectories.append(traj)
+            all_v2x_messages.append(msgs)
+    finally:
+        if executor is not None:
+            executor.shutdown()
+        traj_sink.close()
+        v2x_sink.close()
+
+    all_trajectories = TrajectoryColumns.concat(all_trajectories)
+    all_v2x_messages = V2XColumns.concat(all_v2x_messages)
 
     logger.info(f"Extracted {len(all_trajectories)} trajectory points")
     logger.info(f"Extracted {len(all_v2x_messages)} V2X messages")
 
-    # Fuse data
+    # Fuse data (needs every file: a vehicle's windows can span files)
     logger.info("Fusing trajectory and V2X data...")
     fused_data = fuse_trajectory_and_v2x(all_trajectories, all_v2x_messages)
     logger.info(f"Created {len(fused_data)} fused data points")
 
-    # Convert to DataFrames
-    traj_df = pd.DataFrame([asdict(t) for t in all_trajectories])
-    v2x_df = pd.DataFrame([asdict(m) for m in all_v2x_messages])
-    fused_df = pd.DataFrame([asdict(f) for f in fused_data])
-
-    # Save outputs
-    if output_format == 'parquet':
-        traj_df.to_parquet(output_dir / 'trajectories.parquet', index=False)
-        v2x_df.to_parquet(output_dir / 'v2x_messages.parquet', index=False)
-        fused_df.to_parquet(output_dir / 'fused_data.parquet', index=False)
-    else:
-        traj_df.to_csv(output_dir / 'trajectories.csv', index=False)
-        v2x_df.to_csv(output_dir / 'v2x_messages.csv', index=False)
-        fused_df.to_csv(output_dir / 'fused_data.csv', index=False)
+    fused_sink = _OutputSink(output_dir / f'fused_data.{extension}', FusedColumns, output_format)
+    try:
+        fused_sink.write(fused_data)
+    finally:
+        fused_sink.close()
 
     logger.info(f"Saved results to {output_dir}")
 
     # Compute statistics
+    message_sizes = all_v2x_messages.message_size_bytes
     stats = {
         'total_files': len(json_files),
         'trajectory_points': len(all_trajectories),
         'v2x_messages': len(all_v2x_messages),
         'fused_points': len(fused_data),
-        'unique_vehicles': len(set(t.vehicle_id for t in all_trajectories)),
-        'total_bytes_sent': int(v2x_df['message_size_bytes'].sum()) if len(v2x_df) > 0 else 0,
-        'avg_message_size': float(v2x_df['message_size_bytes'].mean()) if len(v2x_df) > 0 else 0,
+        'unique_vehicles': len(set(all_trajectories.vehicle_id.tolist())),
+        'total_bytes_sent': int(message_sizes.sum()) if len(message_sizes) > 0 else 0,
+        'avg_message_size': float(message_sizes.mean()) if len(message_sizes) > 0 else 0,
     }
 
     return stats
@@ -8,14 +8,23 @@ including smoothing, interpolation, gap detection, and quality flagging.
 from __future__ import annotations
 
 import logging
+from functools import lru_cache
+from operator import attrgetter
 from typing import Dict, List, Optional, Tuple
 
 import numpy as np
-from scipy.interpolate import interp1d
-from scipy.signal import savgol_filter
+import pandas as pd
+from scipy.signal import savgol_coeffs
 
 from .models import GnssRecord, QualityFlags, TrajectorySample
 
+# Optional numba for compiled single-pass kernels
+try:
+    from numba import njit
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+
 # Configure logging
 logger = logging.getLogger(__name__)
 
@@ -26,6 +35,11 @@ DEFAULT_LOW_SPEED_THRESHOLD_MPS = 1.0  # Below this, heading is unreliable
 DEFAULT_SAVGOL_WINDOW = 7  # Must be odd
 DEFAULT_SAVGOL_POLYORDER = 2
 
+# Quality bitmask bits (see quality_bitmask)
+QUALITY_GAP = 1
+QUALITY_EXTRAPOLATED = 2
+QUALITY_LOW_SPEED = 4
+
 
 # ============================================================================
 # Trajectory Preparation
@@ -38,9 +52,13 @@ def sort_records_by_time(records: List[GnssRecord]) -> List[GnssRecord]:
         records: List of GNSS records
 
     Returns:
-        Sorted list (ascending by timestamp)
+        Sorted list (ascending by timestamp, stable for equal timestamps)
     """
-    return sorted(records, key=lambda r: r.timestamp_utc_ms)
+    timestamps = np.fromiter(
+        map(attrgetter('timestamp_utc_ms'), records), dtype=np.int64, count=len(records)
+    )
+    order = np.argsort(timestamps, kind='stable')
+    return [records[i] for i in order.tolist()]
 
 
 def group_records_by_vehicle(
@@ -53,24 +71,93 @@ def group_records_by_vehicle(
 
     Returns:
         Dictionary mapping vehicle_id to sorted list of records
+        (vehicles in order of first appearance)
     """
-    from collections import defaultdict
-    grouped: Dict[str, List[GnssRecord]] = defaultdict(list)
-
-    for rec in records:
-        grouped[rec.vehicle_id].append(rec)
-
-    # Sort each vehicle's records by time
-    for vehicle_id in grouped:
-        grouped[vehicle_id] = sort_records_by_time(grouped[vehicle_id])
+    if not records:
+        return {}
+
+    # One stable sort by (vehicle, timestamp); each vehicle is then a
+    # contiguous, already time-sorted run
+    vehicle_ids = np.empty(len(records), dtype=object)
+    vehicle_ids[:] = [r.vehicle_id for r in records]
+    vehicle_codes, vehicle_ids = pd.factorize(vehicle_ids)
+    timestamps = np.fromiter(
+        map(attrgetter('timestamp_utc_ms'), records), dtype=np.int64, count=len(records)
+    )
+    order = np.lexsort((timestamps, vehicle_codes))
+    boundaries = np.flatnonzero(np.diff(vehicle_codes[order])) + 1
 
-    return dict(grouped)
+    return {
+        vehicle_id: [records[i] for i in group.tolist()]
+        for vehicle_id, group in zip(vehicle_ids, np.split(order, boundaries))
+    }
 
 
 # ============================================================================
 # Gap Detection
 # ============================================================================
 
+def _scan_gaps_loop(
+    timestamps_ms: np.ndarray,
+    gap_threshold_s: float
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Single sweep over timestamps: gap start indices and boundary flags.
+
+    Compiled with numba when available; no intermediate diff array.
+    """
+    n = timestamps_ms.shape[0]
+    flags = np.zeros(n, dtype=np.bool_)
+    gap_starts = np.empty(max(n - 1, 0), dtype=np.int64)
+    n_gaps = 0
+
+    for i in range(1, n):
+        if (timestamps_ms[i] - timestamps_ms[i - 1]) / 1000.0 > gap_threshold_s:
+            gap_starts[n_gaps] = i - 1
+            n_gaps += 1
+            flags[i - 1] = True
+            flags[i] = True
+
+    return gap_starts[:n_gaps], flags
+
+
+def _scan_gaps_numpy(
+    timestamps_ms: np.ndarray,
+    gap_threshold_s: float
+) -> Tuple[np.ndarray, np.ndarray]:
+    """NumPy fallback for _scan_gaps_loop when numba is not installed."""
+    flags = np.zeros(len(timestamps_ms), dtype=bool)
+    if len(timestamps_ms) < 2:
+        return np.empty(0, dtype=np.int64), flags
+
+    gap_starts = np.flatnonzero(np.diff(timestamps_ms) / 1000.0 > gap_threshold_s)
+    flags[gap_starts] = True
+    flags[gap_starts + 1] = True
+    return gap_starts, flags
+
+
+_scan_gaps = njit(cache=True)(_scan_gaps_loop) if HAS_NUMBA else _scan_gaps_numpy
+
+
+def detect_gaps_with_flags(
+    timestamps_ms: np.ndarray,
+    gap_threshold_s: float = DEFAULT_GAP_THRESHOLD_S
+) -> Tuple[List[Tuple[int, int]], np.ndarray]:
+    """Detect gaps and build the matching gap flags in one pass.
+
+    Equivalent to ``detect_gaps`` followed by ``create_gap_flags``.
+
+    Args:
+        timestamps_ms: Array of timestamps in milliseconds
+        gap_threshold_s: Gap threshold in seconds
+
+    Returns:
+        Tuple of (gaps, gap_flags)
+    """
+    gap_starts, flags = _scan_gaps(np.asarray(timestamps_ms), float(gap_threshold_s))
+    gaps = [(idx, idx + 1) for idx in gap_starts.tolist()]
+    return gaps, flags
+
+
 def detect_gaps(
     timestamps_ms: np.ndarray,
     gap_threshold_s: float = DEFAULT_GAP_THRESHOLD_S
@@ -97,15 +184,7 @@ def detect_gaps(
     if len(timestamps_ms) < 2:
         return []
 
-    # Calculate time differences in seconds
-    time_diffs_s = np.diff(timestamps_ms) / 1000.0
-
-    # Find gaps
-    gap_indices = np.where(time_diffs_s > gap_threshold_s)[0]
-
-    # Convert to (start, end) tuples
-    gaps = [(int(idx), int(idx + 1)) for idx in gap_indices]
-
+    gaps, _ = detect_gaps_with_flags(timestamps_ms, gap_threshold_s)
     return gaps
 
 
@@ -128,12 +207,11 @@ def create_gap_flags(
     """
     flags = np.zeros(n_samples, dtype=bool)
 
-    for start_idx, end_idx in gaps:
+    if gaps:
         # Flag samples at gap boundaries
-        if start_idx >= 0:
-            flags[start_idx] = True
-        if end_idx < n_samples:
-            flags[end_idx] = True
+        starts, ends = np.asarray(gaps, dtype=np.int64).T
+        flags[starts[starts >= 0]] = True
+        flags[ends[ends < n_samples]] = True
 
     return flags
 
@@ -142,6 +220,135 @@ def create_gap_flags(
 # Smoothing
 # ============================================================================
 
+# Per-segment status codes returned by the Savitzky-Golay kernels
+_SEGMENT_SMOOTHED = 0
+_SEGMENT_TOO_SHORT = 1
+_SEGMENT_NOT_FINITE = 2
+
+
+@lru_cache(maxsize=None)
+def _savgol_operator(
+    window_length: int,
+    polyorder: int
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Savitzky-Golay filter (mode='interp') as fixed linear weights.
+
+    Returns:
+        Tuple of (coeffs, left_edge, right_edge):
+        - coeffs: convolution weights for interior samples
+        - left_edge / right_edge: (window_length // 2, window_length) matrices
+          mapping the first / last window of a segment to its edge samples
+          (least-squares polynomial fit evaluated at the edge positions)
+    """
+    coeffs = savgol_coeffs(window_length, polyorder)
+    half = window_length // 2
+
+    positions = np.arange(window_length, dtype=np.float64)
+    vander = np.vander(positions, polyorder + 1)
+    hat = vander @ np.linalg.pinv(vander)
+
+    operator = (
+        coeffs,
+        np.ascontiguousarray(hat[:half]),
+        np.ascontiguousarray(hat[window_length - half:])
+    )
+    for array in operator:
+        array.flags.writeable = False
+    return operator
+
+
+def _savgol_segments_loop(
+    values: np.ndarray,
+    coeffs: np.ndarray,
+    left_edge: np.ndarray,
+    right_edge: np.ndarray,
+    segment_starts: np.ndarray,
+    segment_ends: np.ndarray,
+    out: np.ndarray
+) -> np.ndarray:
+    """Smooth every segment into ``out`` in one call; returns segment status.
+
+    Compiled with numba when available. Segments that are too short, or
+    whose first or last window (used for the edge fit) contains NaN/inf,
+    are left unchanged; NaN elsewhere propagates through the convolution
+    as it does in savgol_filter.
+    """
+    window = coeffs.shape[0]
+    half = window // 2
+    status = np.zeros(segment_starts.shape[0], dtype=np.int8)
+
+    for k in range(segment_starts.shape[0]):
+        start = segment_starts[k]
+        end = segment_ends[k]
+        if end - start < window:
+            status[k] = _SEGMENT_TOO_SHORT
+            continue
+
+        finite = True
+        for j in range(window):
+            if not (np.isfinite(values[start + j]) and np.isfinite(values[end - window + j])):
+                finite = False
+                break
+        if not finite:
+            status[k] = _SEGMENT_NOT_FINITE
+            continue
+
+        # Interior: convolution with the filter coefficients
+        for i in range(start + half, end - half):
+            acc = 0.0
+            for j in range(window):
+                acc += coeffs[j] * values[i + half - j]
+            out[i] = acc
+
+        # Edges: polynomial fit over the first / last window
+        for r in range(half):
+            acc_left = 0.0
+            acc_right = 0.0
+            for j in range(window):
+                acc_left += left_edge[r, j] * values[start + j]
+                acc_right += right_edge[r, j] * values[end - window + j]
+            out[start + r] = acc_left
+            out[end - half + r] = acc_right
+
+    return status
+
+
+def _savgol_segments_numpy(
+    values: np.ndarray,
+    coeffs: np.ndarray,
+    left_edge: np.ndarray,
+    right_edge: np.ndarray,
+    segment_starts: np.ndarray,
+    segment_ends: np.ndarray,
+    out: np.ndarray
+) -> np.ndarray:
+    """NumPy fallback for _savgol_segments_loop when numba is not installed."""
+    window = len(coeffs)
+    half = window // 2
+    status = np.zeros(len(segment_starts), dtype=np.int8)
+
+    for k, (start, end) in enumerate(zip(segment_starts.tolist(), segment_ends.tolist())):
+        segment = values[start:end]
+        if len(segment) < window:
+            status[k] = _SEGMENT_TOO_SHORT
+            continue
+        if not (np.isfinite(segment[:window]).all() and np.isfinite(segment[-window:]).all()):
+            status[k] = _SEGMENT_NOT_FINITE
+            continue
+
+        out[start + half:end - half] = np.convolve(segment, coeffs, mode='valid')
+        out[start:start + half] = left_edge @ segment[:window]
+        out[end - half:end] = right_edge @ segment[len(segment) - window:]
+
+    return status
+
+
+_savgol_segments = (
+    njit(cache=True)(_savgol_segments_loop) if HAS_NUMBA
+    else _savgol_segments_numpy
+)
+
+
 def smooth_trajectory(
     values: np.ndarray,
     window_length: int = DEFAULT_SAVGOL_WINDOW,
@@ -164,6 +371,8 @@ def smooth_trajectory(
           continuous segments between gaps
         - Window length must be odd and >= polyorder + 2
         - For short segments, no smoothing is applied
+        - Equivalent to scipy.signal.savgol_filter(mode='interp') per
+          segment, using cached filter weights and a single kernel call
 
     Examples:
         >>> values = np.array([1.0, 2.0, 1.5, 2.5, 2.0, 3.0])
@@ -181,35 +390,38 @@ def smooth_trajectory(
         window_length += 1
         logger.debug(f"Adjusted window_length to {window_length} (must be odd)")
 
-    # If no gaps, smooth entire trajectory
-    if not gaps:
-        try:
-            return savgol_filter(values, window_length, polyorder, mode='interp')
-        except Exception as e:
-            logger.warning(f"Savitzky-Golay filter failed: {e}, returning original")
-            return values.copy()
+    try:
+        coeffs, left_edge, right_edge = _savgol_operator(window_length, polyorder)
+    except Exception as e:
+        logger.warning(f"Savitzky-Golay filter failed: {e}, returning original")
+        return values.copy()
 
-    # Smooth segments between gaps
-    smoothed = values.copy()
-    segment_starts = [0] + [end for _, end in gaps]
-    segment_ends = [start for start, _ in gaps] + [len(values)]
+    # Segments between gaps (the whole trajectory if there are none)
+    if gaps:
+        segment_starts = np.array([0] + [end for _, end in gaps], dtype=np.int64)
+        segment_ends = np.array([start for start, _ in gaps] + [len(values)], dtype=np.int64)
+    else:
+        segment_starts = np.array([0], dtype=np.int64)
+        segment_ends = np.array([len(values)], dtype=np.int64)
 
-    for start, end in zip(segment_starts, segment_ends):
-        segment = values[start:end]
-        segment_length = len(segment)
+    values = np.asarray(values, dtype=np.float64)
+    smoothed = values.copy()
+    status = _savgol_segments(
+        values, coeffs, left_edge, right_edge, segment_starts, segment_ends, smoothed
+    )
 
-        if segment_length >= window_length:
-            try:
-                smoothed[start:end] = savgol_filter(
-                    segment, window_length, polyorder, mode='interp'
+    if not gaps:
+        if status[0] == _SEGMENT_NOT_FINITE:
+            logger.warning("Savitzky-Golay filter failed: array must not contain infs or NaNs, returning original")
+    elif logger.isEnabledFor(logging.DEBUG):
+        for start, end, code in zip(segment_starts.tolist(), segment_ends.tolist(), status.tolist()):
+            if code == _SEGMENT_NOT_FINITE:
+                logger.debug(f"Smoothing failed for segment [{start}:{end}]: array must not contain infs or NaNs")
+            elif code == _SEGMENT_TOO_SHORT:
+                logger.debug(
+                    f"Segment [{start}:{end}] too short for smoothing "
+                    f"({end - start} < {window_length})"
                 )
-            except Exception as e:
-                logger.debug(f"Smoothing failed for segment [{start}:{end}]: {e}")
-        else:
-            logger.debug(
-                f"Segment [{start}:{end}] too short for smoothing "
-                f"({segment_length} < {window_length})"
-            )
 
     return smoothed
 
@@ -251,9 +463,36 @@ def resample_to_1hz(
         >>> len(ts_1hz)
         4  # 0, 1000, 2000, 3000 ms
     """
+    grid_1hz_ms, resampled_values, extrapolated = resample_many_to_1hz(
+        timestamps_ms, values[np.newaxis, :], gaps, gap_threshold_s
+    )
+    return grid_1hz_ms, resampled_values[0], extrapolated
+
+
+def resample_many_to_1hz(
+    timestamps_ms: np.ndarray,
+    values_2d: np.ndarray,
+    gaps: Optional[List[Tuple[int, int]]] = None,
+    gap_threshold_s: float = DEFAULT_GAP_THRESHOLD_S
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Resample several value series sharing the same timestamps to 1Hz.
+
+    Same as calling resample_to_1hz on each row of values_2d, but the grid,
+    interpolation setup, extrapolation flags and gap mask are computed once.
+
+    Args:
+        timestamps_ms: Original timestamps in milliseconds, shape (N,)
+        values_2d: Original values, shape (n_series, N)
+        gaps: Optional list of gap positions
+        gap_threshold_s: Gap threshold in seconds
+
+    Returns:
+        Tuple of (resampled_timestamps_ms, resampled_values_2d, extrapolated_flags)
+        with resampled_values_2d of shape (n_series, len(resampled_timestamps_ms))
+    """
     if len(timestamps_ms) < 2:
         logger.warning("Need at least 2 points for resampling")
-        return timestamps_ms.copy(), values.copy(), np.zeros(len(timestamps_ms), dtype=bool)
+        return timestamps_ms.copy(), values_2d.copy(), np.zeros(len(timestamps_ms), dtype=bool)
 
     # Create 1Hz grid
     start_ms = timestamps_ms[0]
@@ -264,33 +503,32 @@ def resample_to_1hz(
     if gaps is None:
         gaps = detect_gaps(timestamps_ms, gap_threshold_s)
 
-    # Create interpolator
-    # Use 'linear' for most values, but handle gaps
-    interpolator = interp1d(
-        timestamps_ms,
-        values,
-        kind='linear',
-        bounds_error=False,
-        fill_value=np.nan  # NaN for out-of-bounds
-    )
-
-    # Interpolate
-    resampled_values = interpolator(grid_1hz_ms)
+    # Linear interpolation needs increasing sample times
+    sample_ms, samples = timestamps_ms, values_2d
+    if np.any(sample_ms[1:] < sample_ms[:-1]):
+        order = np.argsort(sample_ms, kind='stable')
+        sample_ms, samples = sample_ms[order], samples[:, order]
+
+    # Interpolate each series against the shared grid (NaN for out-of-bounds)
+    resampled_values = np.empty((len(samples), len(grid_1hz_ms)), dtype=np.float64)
+    for row, series in enumerate(samples):
+        resampled_values[row] = np.interp(
+            grid_1hz_ms, sample_ms, series, left=np.nan, right=np.nan
+        )
 
     # Mark extrapolated points (outside original range)
-    extrapolated = np.zeros(len(grid_1hz_ms), dtype=bool)
-    extrapolated[grid_1hz_ms < timestamps_ms[0]] = True
-    extrapolated[grid_1hz_ms > timestamps_ms[-1]] = True
+    extrapolated = (grid_1hz_ms < timestamps_ms[0]) | (grid_1hz_ms > timestamps_ms[-1])
 
-    # Set values across gaps to NaN
+    # Set values across gaps to NaN (mask shared by all series)
     if gaps:
+        in_gap = np.zeros(len(grid_1hz_ms), dtype=bool)
         for start_idx, end_idx in gaps:
             gap_start_ms = timestamps_ms[start_idx]
             gap_end_ms = timestamps_ms[end_idx]
 
             # Find grid points within gap
-            in_gap = (grid_1hz_ms > gap_start_ms) & (grid_1hz_ms < gap_end_ms)
-            resampled_values[in_gap] = np.nan
+            in_gap |= (grid_1hz_ms > gap_start_ms) & (grid_1hz_ms < gap_end_ms)
+        resampled_values[:, in_gap] = np.nan
 
     return grid_1hz_ms, resampled_values, extrapolated
 
@@ -299,6 +537,92 @@ def resample_to_1hz(
 # Quality Flags
 # ============================================================================
 
+def _quality_bitmask_loop(
+    gap_flags: np.ndarray,
+    extrapolated_flags: np.ndarray,
+    speeds_mps: np.ndarray,
+    low_speed_threshold: float
+) -> np.ndarray:
+    """Per-sample quality bitmask in one sweep (compiled with numba when available)."""
+    n = gap_flags.shape[0]
+    n_speeds = speeds_mps.shape[0]
+    out = np.zeros(n, dtype=np.uint8)
+
+    for i in range(n):
+        bits = 0
+        if gap_flags[i]:
+            bits |= QUALITY_GAP
+        if extrapolated_flags[i]:
+            bits |= QUALITY_EXTRAPOLATED
+        # NaN speed compares False: not low speed
+        if i < n_speeds and speeds_mps[i] < low_speed_threshold:
+            bits |= QUALITY_LOW_SPEED
+        out[i] = bits
+
+    return out
+
+
+def _quality_bitmask_numpy(
+    gap_flags: np.ndarray,
+    extrapolated_flags: np.ndarray,
+    speeds_mps: np.ndarray,
+    low_speed_threshold: float
+) -> np.ndarray:
+    """NumPy fallback for _quality_bitmask_loop when numba is not installed."""
+    n = len(gap_flags)
+    low_speed = np.zeros(n, dtype=bool)
+    m = min(n, len(speeds_mps))
+    low_speed[:m] = speeds_mps[:m] < low_speed_threshold
+
+    out = gap_flags.astype(np.uint8) * np.uint8(QUALITY_GAP)
+    out |= extrapolated_flags.astype(np.uint8) * np.uint8(QUALITY_EXTRAPOLATED)
+    out |= low_speed.astype(np.uint8) * np.uint8(QUALITY_LOW_SPEED)
+    return out
+
+
+_quality_bitmask = njit(cache=True)(_quality_bitmask_loop) if HAS_NUMBA else _quality_bitmask_numpy
+
+
+def quality_bitmask(
+    gap_flags: np.ndarray,
+    extrapolated_flags: np.ndarray,
+    speeds_mps: Optional[np.ndarray] = None,
+    low_speed_threshold: float = DEFAULT_LOW_SPEED_THRESHOLD_MPS
+) -> np.ndarray:
+    """Quality flags for each trajectory sample as a uint8 bitmask.
+
+    Bits are QUALITY_GAP, QUALITY_EXTRAPOLATED and QUALITY_LOW_SPEED; see
+    create_quality_flags for their meaning.
+
+    Args:
+        gap_flags: Boolean array indicating samples near gaps
+        extrapolated_flags: Boolean array indicating extrapolated samples
+        speeds_mps: Optional array of speeds in m/s
+        low_speed_threshold: Speed below which heading is unreliable
+
+    Returns:
+        uint8 array, one bitmask per sample
+    """
+    if speeds_mps is None:
+        speeds_mps = np.empty(0, dtype=np.float64)
+
+    return _quality_bitmask(
+        np.asarray(gap_flags, dtype=np.bool_),
+        np.asarray(extrapolated_flags, dtype=np.bool_),
+        np.asarray(speeds_mps, dtype=np.float64),
+        float(low_speed_threshold)
+    )
+
+
+def _quality_flags_from_bits(bits: int) -> QualityFlags:
+    """QualityFlags for one bitmask value (fields are plain bools, no validation needed)."""
+    return QualityFlags.model_construct(
+        gap=bool(bits & QUALITY_GAP),
+        extrapolated=bool(bits & QUALITY_EXTRAPOLATED),
+        low_speed=bool(bits & QUALITY_LOW_SPEED)
+    )
+
+
 def create_quality_flags(
     gap_flags: np.ndarray,
     extrapolated_flags: np.ndarray,
@@ -316,6 +640,9 @@ def create_quality_flags(
     Returns:
         List of QualityFlags objects
 
+    Notes:
+        Use quality_bitmask() when per-sample objects are not needed.
+
     Examples:
         >>> gap_flags = np.array([False, True, False])
         >>> extrap_flags = np.array([False, False, True])
@@ -324,24 +651,8 @@ def create_quality_flags(
         >>> flags[1].low_speed
         True
     """
-    n_samples = len(gap_flags)
-    quality_flags = []
-
-    for i in range(n_samples):
-        low_speed = False
-        if speeds_mps is not None and i < len(speeds_mps):
-            if not np.isnan(speeds_mps[i]):
-                low_speed = speeds_mps[i] < low_speed_threshold
-
-        quality_flags.append(
-            QualityFlags(
-                gap=bool(gap_flags[i]),
-                extrapolated=bool(extrapolated_flags[i]),
-                low_speed=low_speed
-            )
-        )
-
-    return quality_flags
+    bits = quality_bitmask(gap_flags, extrapolated_flags, speeds_mps, low_speed_threshold)
+    return [_quality_flags_from_bits(b) for b in bits.tolist()]
 
 
 # ============================================================================
@@ -397,19 +708,32 @@ def extract_trajectory(
         logger.warning(f"No records for vehicle {vehicle_id}")
         return []
 
-    # Step 1: Sort by time
-    sorted_records = sort_records_by_time(records)
-
-    # Step 2: Extract arrays
-    timestamps_ms = np.array([r.timestamp_utc_ms for r in sorted_records])
-    lats = np.array([r.latitude_deg for r in sorted_records])
-    lons = np.array([r.longitude_deg for r in sorted_records])
-    alts = np.array([r.altitude_m if r.altitude_m is not None else np.nan
-                     for r in sorted_records])
-    speeds = np.array([r.speed_mps if r.speed_mps is not None else np.nan
-                       for r in sorted_records])
-    headings = np.array([r.heading_deg if r.heading_deg is not None else np.nan
-                         for r in sorted_records])
+    # Steps 1-2: Extract arrays in one pass over the records into
+    # preallocated arrays, then sort them by time (stable, like
+    # sort_records_by_time)
+    n = len(records)
+    timestamps_ms = np.empty(n, dtype=np.int64)
+    lats = np.empty(n, dtype=np.float64)
+    lons = np.empty(n, dtype=np.float64)
+    alts = np.empty(n, dtype=np.float64)
+    speeds = np.empty(n, dtype=np.float64)
+    headings = np.empty(n, dtype=np.float64)
+
+    nan = np.nan
+    for i, r in enumerate(records):
+        timestamps_ms[i] = r.timestamp_utc_ms
+        lats[i] = r.latitude_deg
+        lons[i] = r.longitude_deg
+        alt, speed, heading = r.altitude_m, r.speed_mps, r.heading_deg
+        alts[i] = nan if alt is None else alt
+        speeds[i] = nan if speed is None else speed
+        headings[i] = nan if heading is None else heading
+
+    order = np.argsort(timestamps_ms, kind='stable')
+    timestamps_ms, lats, lons, alts, speeds, headings = (
+        timestamps_ms[order], lats[order], lons[order],
+        alts[order], speeds[order], headings[order]
+    )
 
     # Step 3: Detect gaps
     gaps = detect_gaps(timestamps_ms, gap_threshold_s)
@@ -430,24 +754,13 @@ def extract_trajectory(
     if target_hz != 1:
         logger.warning(f"Only 1Hz resampling supported, using 1Hz instead of {target_hz}Hz")
 
-    grid_ts_ms, resampled_lats, extrap_lats = resample_to_1hz(
-        timestamps_ms, lats, gaps, gap_threshold_s
-    )
-    _, resampled_lons, extrap_lons = resample_to_1hz(
-        timestamps_ms, lons, gaps, gap_threshold_s
-    )
-    _, resampled_alts, _ = resample_to_1hz(
-        timestamps_ms, alts, gaps, gap_threshold_s
-    )
-    _, resampled_speeds, _ = resample_to_1hz(
-        timestamps_ms, speeds, gaps, gap_threshold_s
-    )
-    _, resampled_headings, _ = resample_to_1hz(
-        timestamps_ms, headings, gaps, gap_threshold_s
+    grid_ts_ms, resampled, extrapolated_flags = resample_many_to_1hz(
+        timestamps_ms,
+        np.stack([lats, lons, alts, speeds, headings]),
+        gaps,
+        gap_threshold_s
     )
-
-    # Combine extrapolation flags
-    extrapolated_flags = extrap_lats | extrap_lons
+    resampled_lats, resampled_lons, resampled_alts, resampled_speeds, resampled_headings = resampled
 
     # Step 6: Create gap flags for resampled grid
     # Map original gaps to resampled grid
@@ -463,8 +776,9 @@ def extract_trajectory(
             )
             gap_flags |= near_gap
 
-    # Step 7: Create quality flags
-    quality_flags = create_quality_flags(
+    # Step 7: Quality flags as a bitmask; QualityFlags objects are only
+    # built for the samples that are kept
+    quality_bits = quality_bitmask(
         gap_flags,
         extrapolated_flags,
         resampled_speeds,
@@ -472,29 +786,40 @@ def extract_trajectory(
     )
 
     # Step 8: Build TrajectorySample objects
-    trajectory = []
-    for i in range(len(grid_ts_ms)):
-        # Skip NaN values (from gaps or extrapolation)
-        if np.isnan(resampled_lats[i]) or np.isnan(resampled_lons[i]):
-            continue
+    # Skip NaN positions (from gaps or extrapolation); pull the kept samples
+    # out as Python lists once, with NaN -> None for the optional fields
+    valid_idx = np.flatnonzero(~(np.isnan(resampled_lats) | np.isnan(resampled_lons)))
 
-        sample = TrajectorySample(
+    def optional_values(values: np.ndarray) -> list:
+        return [None if v != v else v for v in values[valid_idx].tolist()]
+
+    trajectory = [
+        TrajectorySample(
             vehicle_id=vehicle_id,
-            timestamp_utc_ms=int(grid_ts_ms[i]),
-            lat_deg=float(resampled_lats[i]),
-            lon_deg=float(resampled_lons[i]),
-            alt_m=float(resampled_alts[i]) if not np.isnan(resampled_alts[i]) else None,
+            timestamp_utc_ms=ts,
+            lat_deg=lat,
+            lon_deg=lon,
+            alt_m=alt,
             x_m=0.0,  # Will be set by coordinate transformation
             y_m=0.0,  # Will be set by coordinate transformation
-            speed_mps=float(resampled_speeds[i]) if not np.isnan(resampled_speeds[i]) else None,
-            heading_deg=float(resampled_headings[i]) if not np.isnan(resampled_headings[i]) else None,
-            quality=quality_flags[i]
+            speed_mps=speed,
+            heading_deg=heading,
+            quality=_quality_flags_from_bits(bits)
+        )
+        for ts, lat, lon, alt, speed, heading, bits in zip(
+            grid_ts_ms[valid_idx].tolist(),
+            resampled_lats[valid_idx].tolist(),
+            resampled_lons[valid_idx].tolist(),
+            optional_values(resampled_alts),
+            optional_values(resampled_speeds),
+            optional_values(resampled_headings),
+            quality_bits[valid_idx].tolist()
         )
-        trajectory.append(sample)
+    ]
 
     logger.info(
         f"Vehicle {vehicle_id}: extracted {len(trajectory)} trajectory samples "
-        f"({len(sorted_records)} original records)"
+        f"({len(records)} original records)"
     )
 
     return trajectory
@@ -8,18 +8,191 @@ heatmaps, and time series analysis.
 from __future__ import annotations
 
 import logging
+from functools import lru_cache
+from itertools import chain
+from operator import attrgetter
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Any, Dict, List, Optional, Sequence
 
 import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
+from matplotlib.collections import LineCollection
+from matplotlib.lines import Line2D
 import numpy as np
-import pandas as pd
 import seaborn as sns
 
+from ._binning import bin2d_sum_count
 from .models import FusedRecord, TrajectorySample
 
+try:
+    from fast_histogram import histogram2d as _fast_histogram2d
+    HAS_FAST_HISTOGRAM = True
+except ImportError:
+    HAS_FAST_HISTOGRAM = False
+
 logger = logging.getLogger(__name__)
 
+DEFAULT_DPI = 100
+AGG_PATH_CHUNKSIZE = 10000
+# Artists with at least this many points are rasterized in vector output
+RASTERIZE_MIN_POINTS = 10000
+HEATMAP_MIN_GRID_SIZE = 10
+# Longer polylines are stride-decimated, larger scatter layers subsampled
+MAX_PLOT_POINTS = 20000
+
+# Marker styles for trajectory map points, by quality
+_QUALITY_MARKER_STYLES = {
+    'normal': {'s': 10, 'marker': 'o', 'alpha': 0.7},
+    'gap': {'s': 30, 'marker': 'x', 'alpha': 0.9},
+    'low_speed': {'s': 15, 'marker': '^', 'alpha': 0.7},
+}
+_PLAIN_MARKER_STYLES = {
+    'normal': {'s': 16, 'marker': 'o', 'alpha': 0.6},
+}
+
+
+def _records_to_arrays(
+    records: Sequence[Any],
+    fields: Dict[str, Any]
+) -> Dict[str, np.ndarray]:
+    """Extract record attributes into NumPy arrays in a single pass.
+
+    Args:
+        records: Records (e.g. FusedRecord or TrajectorySample)
+        fields: Mapping of attribute name (dotted names such as
+                'quality.gap' allowed) to NumPy dtype
+
+    Returns:
+        Dict of attribute name -> array; None becomes NaN in float arrays
+    """
+    n = len(records)
+    names = list(fields)
+    arrays = [np.empty(n, dtype=fields[name]) for name in names]
+    getters = [attrgetter(name) for name in names]
+    missing = [np.nan if a.dtype.kind == 'f' else None for a in arrays]
+    columns = list(zip(arrays, getters, missing))
+
+    for i, record in enumerate(records):
+        for array, getter, missing_value in columns:
+            value = getter(record)
+            array[i] = missing_value if value is None else value
+
+    return dict(zip(names, arrays))
+
+
+def _group_slices(keys: np.ndarray):
+    """Group an array by key with one stable sort.
+
+    Args:
+        keys: 1D array of group keys
+
+    Returns:
+        Tuple of (sorted unique keys, permutation that orders records by key
+        while keeping their original order within each key, group end
+        offsets into the permuted order)
+    """
+    unique_keys, codes = np.unique(keys, return_inverse=True)
+    order = np.argsort(codes, kind='stable')
+    ends = np.cumsum(np.bincount(codes, minlength=len(unique_keys)))
+    return unique_keys, order, ends
+
+
+@lru_cache(maxsize=32)
+def _husl_palette(n_colors: int) -> np.ndarray:
+    """Cached (n_colors, 3) husl palette; read-only since it is shared."""
+    palette = np.asarray(sns.color_palette("husl", n_colors))
+    palette.flags.writeable = False
+    return palette
+
+
+def _vehicle_palette(vehicle_ids: Sequence[str]) -> Dict[str, np.ndarray]:
+    """Map each vehicle ID to a distinct husl color (RGB array)."""
+    return dict(zip(vehicle_ids, _husl_palette(len(vehicle_ids))))
+
+
+def _maybe_decimate(*arrays: np.ndarray, max_points: int = MAX_PLOT_POINTS):
+    """Stride-decimate polyline coordinate arrays to at most max_points.
+
+    Arrays of length <= max_points are returned unchanged. Otherwise every
+    k-th point is kept (k chosen so at most max_points remain), plus the
+    last point so the line still spans the full range.
+
+    Returns:
+        Tuple of the (possibly decimated) arrays, in input order
+    """
+    n = len(arrays[0])
+    if n <= max_points:
+        return arrays
+    step = -(-(n - 1) // (max_points - 1))  # ceil
+    index = np.append(np.arange(0, n - 1, step), n - 1)
+    return tuple(array[index] for array in arrays)
+
+
+def _maybe_subsample(*arrays: np.ndarray, max_points: int = MAX_PLOT_POINTS):
+    """Randomly subsample scatter point arrays to at most max_points.
+
+    Uses a fixed seed so repeated plots of the same data are identical;
+    the kept points stay in input order.
+
+    Returns:
+        Tuple of the (possibly subsampled) arrays, in input order
+    """
+    n = len(arrays[0])
+    if n <= max_points:
+        return arrays
+    index = np.sort(np.random.default_rng(0).choice(n, size=max_points, replace=False))
+    return tuple(array[index] for array in arrays)
+
+
+# ============================================================================
+# Figure Setup / Saving
+# ============================================================================
+
+def _setup_figure(figsize: tuple, fig: Optional[Figure] = None):
+    """Create a figure with one axes, or clear and reuse ``fig``.
+
+    The tight layout engine is set on the figure so saving does not need
+    ``bbox_inches='tight'`` (which renders the figure twice).
+
+    Returns:
+        Tuple of (fig, ax, owns_figure)
+    """
+    if fig is None:
+        fig, ax = plt.subplots(figsize=figsize, layout='tight')
+        return fig, ax, True
+
+    fig.clear()
+    fig.set_size_inches(figsize)
+    fig.set_layout_engine('tight')
+    return fig, fig.add_subplot(), False
+
+
+def _finish_figure(
+    fig: Figure,
+    output_path: Optional[Path],
+    dpi: int,
+    bbox_inches: Optional[str],
+    owns_figure: bool,
+    description: str
+) -> None:
+    """Save the figure (or show it), then close it if it was created here.
+
+    Data artists with RASTERIZE_MIN_POINTS or more points are created with
+    ``rasterized=True``, so vector outputs (PDF/SVG) embed them as one image
+    instead of one path per point.
+    """
+    if output_path:
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        # Feed long polylines to Agg in chunks
+        with plt.rc_context({'agg.path.chunksize': AGG_PATH_CHUNKSIZE}):
+            fig.savefig(output_path, dpi=dpi, bbox_inches=bbox_inches)
+        logger.info(f"Saved {description} to {output_path}")
+    else:
+        plt.show()
+
+    if owns_figure:
+        plt.close(fig)
+
 
 # ============================================================================
 # Trajectory Map Plotting
@@ -30,7 +203,11 @@ def plot_trajectory_map(
     output_path: Optional[Path] = None,
     title: str = "Vehicle Trajectories",
     figsize: tuple = (12, 10),
-    show_quality: bool = True
+    show_quality: bool = True,
+    dpi: int = DEFAULT_DPI,
+    bbox_inches: Optional[str] = None,
+    fig: Optional[Figure] = None,
+    color_by_vehicle: Optional[Dict[str, Any]] = None
 ) -> None:
     """Plot vehicle trajectories on a 2D map.
 
@@ -40,6 +217,11 @@ def plot_trajectory_map(
         title: Plot title
         figsize: Figure size (width, height)
         show_quality: If True, color-code by quality flags
+        dpi: Resolution of the saved figure
+        bbox_inches: Passed to savefig; 'tight' costs an extra render pass
+        fig: Optional figure to clear and reuse instead of creating one
+        color_by_vehicle: Optional vehicle_id -> color mapping shared across
+                          plots (default: husl palette over these vehicles)
 
     Notes:
         - Requires x_m and y_m to be set (after coordinate transformation)
@@ -50,47 +232,76 @@ def plot_trajectory_map(
         logger.warning("No trajectories to plot")
         return
 
-    fig, ax = plt.subplots(figsize=figsize)
+    fig, ax, owns_figure = _setup_figure(figsize, fig)
 
     # Use a color palette with enough colors
-    colors = sns.color_palette("husl", len(trajectories_by_vehicle))
+    if color_by_vehicle is None:
+        color_by_vehicle = _vehicle_palette(list(trajectories_by_vehicle))
+    colors = np.asarray([color_by_vehicle[vid] for vid in trajectories_by_vehicle])
+
+    # Collect all vehicles first, then draw one LineCollection for the
+    # polylines and one scatter per marker style
+    marker_styles = _QUALITY_MARKER_STYLES if show_quality else _PLAIN_MARKER_STYLES
+    segments = []
+    segment_colors = []
+    legend_handles = []
+    points = {kind: ([], [], []) for kind in marker_styles}
+
+    def add_points(kind, x, y, idx):
+        xs, ys, color_idx = points[kind]
+        xs.append(x)
+        ys.append(y)
+        color_idx.append(np.full(len(x), idx))
 
     for idx, (vehicle_id, trajectory) in enumerate(trajectories_by_vehicle.items()):
         if not trajectory:
             continue
 
-        x_values = [t.x_m for t in trajectory]
-        y_values = [t.y_m for t in trajectory]
+        arrays = _records_to_arrays(
+            trajectory,
+            {'x_m': float, 'y_m': float, 'quality.gap': bool, 'quality.low_speed': bool}
+        )
+        x_values = arrays['x_m']
+        y_values = arrays['y_m']
 
         if show_quality:
-            # Separate by quality
-            normal_x, normal_y = [], []
-            gap_x, gap_y = [], []
-            low_speed_x, low_speed_y = [], []
-
-            for t in trajectory:
-                if t.quality.gap:
-                    gap_x.append(t.x_m)
-                    gap_y.append(t.y_m)
-                elif t.quality.low_speed:
-                    low_speed_x.append(t.x_m)
-                    low_speed_y.append(t.y_m)
-                else:
-                    normal_x.append(t.x_m)
-                    normal_y.append(t.y_m)
-
-            # Plot with different markers
-            if normal_x:
-                ax.plot(normal_x, normal_y, '-', color=colors[idx], alpha=0.6, linewidth=1)
-                ax.scatter(normal_x, normal_y, c=[colors[idx]], s=10, alpha=0.7, label=vehicle_id)
-            if gap_x:
-                ax.scatter(gap_x, gap_y, c=[colors[idx]], s=30, marker='x', alpha=0.9)
-            if low_speed_x:
-                ax.scatter(low_speed_x, low_speed_y, c=[colors[idx]], s=15, marker='^', alpha=0.7)
+            # Separate by quality (gap takes precedence over low speed)
+            gap_mask = arrays['quality.gap']
+            low_speed_mask = arrays['quality.low_speed'] & ~gap_mask
+            normal_mask = ~(gap_mask | low_speed_mask)
+
+            if normal_mask.any():
+                normal_x, normal_y = x_values[normal_mask], y_values[normal_mask]
+                segments.append(np.column_stack(_maybe_decimate(normal_x, normal_y)))
+                segment_colors.append(colors[idx])
+                add_points('normal', normal_x, normal_y, idx)
+                legend_handles.append(Line2D([], [], color=colors[idx], marker='o',
+                                             markersize=3, alpha=0.7, label=vehicle_id))
+            if gap_mask.any():
+                add_points('gap', x_values[gap_mask], y_values[gap_mask], idx)
+            if low_speed_mask.any():
+                add_points('low_speed', x_values[low_speed_mask], y_values[low_speed_mask], idx)
         else:
             # Simple line plot
-            ax.plot(x_values, y_values, '-o', color=colors[idx], alpha=0.6,
-                   linewidth=1, markersize=4, label=vehicle_id)
+            segments.append(np.column_stack(_maybe_decimate(x_values, y_values)))
+            segment_colors.append(colors[idx])
+            add_points('normal', x_values, y_values, idx)
+            legend_handles.append(Line2D([], [], color=colors[idx], marker='o', markersize=4,
+                                         alpha=0.6, linewidth=1, label=vehicle_id))
+
+    rasterized = sum(len(segment) for segment in segments) >= RASTERIZE_MIN_POINTS
+    if segments:
+        ax.add_collection(LineCollection(segments, colors=segment_colors,
+                                         linewidths=1, alpha=0.6, rasterized=rasterized))
+    for kind, style in marker_styles.items():
+        xs, ys, color_idx = points[kind]
+        if xs:
+            x_all, y_all, idx_all = _maybe_subsample(
+                np.concatenate(xs), np.concatenate(ys), np.concatenate(color_idx)
+            )
+            ax.scatter(x_all, y_all, c=colors[idx_all],
+                       rasterized=len(x_all) >= RASTERIZE_MIN_POINTS, **style)
+    ax.autoscale_view()
 
     ax.set_xlabel("X (meters)")
     ax.set_ylabel("Y (meters)")
@@ -100,30 +311,86 @@ def plot_trajectory_map(
 
     # Legend only if not too many vehicles
     if len(trajectories_by_vehicle) <= 20:
-        ax.legend(bbox_to_anchor=(1.05, 1), loc='upper left', fontsize=8)
-
-    plt.tight_layout()
-
-    if output_path:
-        output_path.parent.mkdir(parents=True, exist_ok=True)
-        plt.savefig(output_path, dpi=150, bbox_inches='tight')
-        logger.info(f"Saved trajectory map to {output_path}")
-    else:
-        plt.show()
+        ax.legend(handles=legend_handles, bbox_to_anchor=(1.05, 1), loc='upper left', fontsize=8)
 
-    plt.close()
+    _finish_figure(fig, output_path, dpi, bbox_inches, owns_figure, "trajectory map")
 
 
 # ============================================================================
 # Heatmap Plotting
 # ============================================================================
 
+def _grid_cell_sums(
+    x: np.ndarray,
+    y: np.ndarray,
+    weights: np.ndarray,
+    grid_size: int,
+    use_fast_histogram: bool = True
+) -> tuple:
+    """Bin points onto a uniform grid and sum weights per cell.
+
+    Cells are half-open [edge_i, edge_i+1), so points on the maximum x or y
+    edge fall outside the grid. Uses fast_histogram when it is installed
+    and use_fast_histogram is True, otherwise ``_binning.bin2d_sum_count``
+    (numba-compiled when available).
+
+    Returns:
+        Tuple of (x_bins, y_bins, sums, counts); sums and counts have shape
+        (grid_size - 1, grid_size - 1), indexed [y_cell, x_cell]
+    """
+    x_bins = np.linspace(x.min(), x.max(), grid_size)
+    y_bins = np.linspace(y.min(), y.max(), grid_size)
+    n_cells = grid_size - 1
+
+    if not (x_bins[-1] > x_bins[0] and y_bins[-1] > y_bins[0]):
+        # Zero-width range: every point lies on a max edge
+        return (
+            x_bins,
+            y_bins,
+            np.zeros((n_cells, n_cells)),
+            np.zeros((n_cells, n_cells), dtype=np.int64)
+        )
+
+    if use_fast_histogram and HAS_FAST_HISTOGRAM:
+        # fast_histogram returns [x_cell, y_cell]; transpose to [y_cell, x_cell]
+        hist_range = [[x_bins[0], x_bins[-1]], [y_bins[0], y_bins[-1]]]
+        sums = _fast_histogram2d(x, y, bins=n_cells, range=hist_range, weights=weights)
+        counts = _fast_histogram2d(x, y, bins=n_cells, range=hist_range)
+        return x_bins, y_bins, sums.T, counts.T.astype(np.int64)
+
+    sums, counts = bin2d_sum_count(
+        x, y, weights,
+        x_bins[0], x_bins[-1], y_bins[0], y_bins[-1],
+        n_cells, n_cells
+    )
+    return x_bins, y_bins, sums, counts
+
+
+def _heatmap_grid_size(n_points: int, grid_size: int) -> int:
+    """Shrink the heatmap grid when there are few points per cell.
+
+    With fewer than grid_size**2 / 10 points the grid is reduced to about
+    sqrt(n_points) edges per dimension (at least 10, never more than
+    requested), so sparse data is not spread over mostly empty cells.
+    """
+    if n_points >= grid_size * grid_size / 10:
+        return grid_size
+    reduced = min(grid_size, max(HEATMAP_MIN_GRID_SIZE, int(np.sqrt(n_points))))
+    if reduced != grid_size:
+        logger.debug(f"Reducing heatmap grid from {grid_size} to {reduced} for {n_points} points")
+    return reduced
+
+
 def plot_latency_heatmap(
     fused_records: List[FusedRecord],
     output_path: Optional[Path] = None,
     title: str = "Average Latency Heatmap",
     figsize: tuple = (12, 10),
-    grid_size: int = 50
+    grid_size: int = 50,
+    use_fast_histogram: bool = True,
+    dpi: int = DEFAULT_DPI,
+    bbox_inches: Optional[str] = None,
+    fig: Optional[Figure] = None
 ) -> None:
     """Plot 2D heatmap of average latency across space.
 
@@ -132,7 +399,12 @@ def plot_latency_heatmap(
         output_path: Optional path to save figure
         title: Plot title
         figsize: Figure size
-        grid_size: Number of grid cells per dimension
+        grid_size: Number of grid cells per dimension (reduced for sparse
+                   data, see _heatmap_grid_size)
+        use_fast_histogram: Use fast_histogram for binning if installed
+        dpi: Resolution of the saved figure
+        bbox_inches: Passed to savefig; 'tight' costs an extra render pass
+        fig: Optional figure to clear and reuse instead of creating one
 
     Notes:
         - Requires fused records with valid x_m, y_m, avg_latency_ms
@@ -143,60 +415,51 @@ def plot_latency_heatmap(
         return
 
     # Extract data
-    x_values = [r.x_m for r in fused_records if r.avg_latency_ms is not None]
-    y_values = [r.y_m for r in fused_records if r.avg_latency_ms is not None]
-    latencies = [r.avg_latency_ms for r in fused_records if r.avg_latency_ms is not None]
+    arrays = _records_to_arrays(
+        fused_records, {'x_m': float, 'y_m': float, 'avg_latency_ms': float}
+    )
+    valid = (
+        np.isfinite(arrays['x_m']) & np.isfinite(arrays['y_m'])
+        & ~np.isnan(arrays['avg_latency_ms'])
+    )
+    x_values = arrays['x_m'][valid]
+    y_values = arrays['y_m'][valid]
+    latencies = arrays['avg_latency_ms'][valid]
 
     if len(x_values) == 0:
         logger.warning("No latency data available")
         return
+    grid_size = _heatmap_grid_size(len(x_values), grid_size)
 
     # Create 2D histogram
-    fig, ax = plt.subplots(figsize=figsize)
-
-    # Bin the data
-    x_bins = np.linspace(min(x_values), max(x_values), grid_size)
-    y_bins = np.linspace(min(y_values), max(y_values), grid_size)
+    fig, ax, owns_figure = _setup_figure(figsize, fig)
 
     # Calculate average latency in each bin
-    latency_grid = np.full((grid_size - 1, grid_size - 1), np.nan)
-
-    for i in range(grid_size - 1):
-        for j in range(grid_size - 1):
-            mask = (
-                (np.array(x_values) >= x_bins[i]) &
-                (np.array(x_values) < x_bins[i + 1]) &
-                (np.array(y_values) >= y_bins[j]) &
-                (np.array(y_values) < y_bins[j + 1])
-            )
-            if np.any(mask):
-                latency_grid[j, i] = np.mean(np.array(latencies)[mask])
+    x_bins, y_bins, latency_sums, counts = _grid_cell_sums(
+        x_values, y_values, latencies, grid_size, use_fast_histogram
+    )
+    occupied = counts > 0
+    latency_grid = np.ma.masked_array(
+        np.divide(latency_sums, counts, out=np.zeros_like(latency_sums), where=occupied),
+        mask=~occupied
+    )
 
-    # Plot heatmap
-    im = ax.imshow(
+    # Plot heatmap: one quad per cell, empty (masked) cells are not drawn
+    im = ax.pcolormesh(
+        x_bins,
+        y_bins,
         latency_grid,
-        extent=[x_bins[0], x_bins[-1], y_bins[0], y_bins[-1]],
-        origin='lower',
-        aspect='equal',
         cmap='YlOrRd',
-        interpolation='bilinear'
+        shading='flat'
     )
+    ax.set_aspect('equal')
 
-    plt.colorbar(im, ax=ax, label='Average Latency (ms)')
+    fig.colorbar(im, ax=ax, label='Average Latency (ms)')
     ax.set_xlabel("X (meters)")
     ax.set_ylabel("Y (meters)")
     ax.set_title(title)
 
-    plt.tight_layout()
-
-    if output_path:
-        output_path.parent.mkdir(parents=True, exist_ok=True)
-        plt.savefig(output_path, dpi=150, bbox_inches='tight')
-        logger.info(f"Saved latency heatmap to {output_path}")
-    else:
-        plt.show()
-
-    plt.close()
+    _finish_figure(fig, output_path, dpi, bbox_inches, owns_figure, "latency heatmap")
 
 
 def plot_throughput_heatmap(
@@ -204,7 +467,11 @@ def plot_throughput_heatmap(
     output_path: Optional[Path] = None,
     title: str = "Total Throughput Heatmap",
     figsize: tuple = (12, 10),
-    grid_size: int = 50
+    grid_size: int = 50,
+    use_fast_histogram: bool = True,
+    dpi: int = DEFAULT_DPI,
+    bbox_inches: Optional[str] = None,
+    fig: Optional[Figure] = None
 ) -> None:
     """Plot 2D heatmap of total throughput (tx + rx bytes) across space.
 
@@ -213,37 +480,40 @@ def plot_throughput_heatmap(
         output_path: Optional path to save figure
         title: Plot title
         figsize: Figure size
-        grid_size: Number of grid cells per dimension
+        grid_size: Number of grid cells per dimension (reduced for sparse
+                   data, see _heatmap_grid_size)
+        use_fast_histogram: Use fast_histogram for binning if installed
+        dpi: Resolution of the saved figure
+        bbox_inches: Passed to savefig; 'tight' costs an extra render pass
+        fig: Optional figure to clear and reuse instead of creating one
     """
     if not fused_records:
         logger.warning("No fused records to plot")
         return
 
     # Extract data
-    x_values = [r.x_m for r in fused_records]
-    y_values = [r.y_m for r in fused_records]
-    throughput = [r.tx_bytes + r.rx_bytes for r in fused_records]
+    arrays = _records_to_arrays(
+        fused_records, {'x_m': float, 'y_m': float, 'tx_bytes': np.int64, 'rx_bytes': np.int64}
+    )
+    valid = np.isfinite(arrays['x_m']) & np.isfinite(arrays['y_m'])
+    x_values = arrays['x_m'][valid]
+    y_values = arrays['y_m'][valid]
+    throughput = np.add(
+        arrays['tx_bytes'][valid], arrays['rx_bytes'][valid], dtype=np.float64
+    )
 
-    # Create 2D histogram
-    fig, ax = plt.subplots(figsize=figsize)
+    if len(x_values) == 0:
+        logger.warning("No position data available")
+        return
+    grid_size = _heatmap_grid_size(len(x_values), grid_size)
 
-    # Bin the data
-    x_bins = np.linspace(min(x_values), max(x_values), grid_size)
-    y_bins = np.linspace(min(y_values), max(y_values), grid_size)
+    # Create 2D histogram
+    fig, ax, owns_figure = _setup_figure(figsize, fig)
 
     # Calculate total throughput in each bin
-    throughput_grid = np.zeros((grid_size - 1, grid_size - 1))
-
-    for i in range(grid_size - 1):
-        for j in range(grid_size - 1):
-            mask = (
-                (np.array(x_values) >= x_bins[i]) &
-                (np.array(x_values) < x_bins[i + 1]) &
-                (np.array(y_values) >= y_bins[j]) &
-                (np.array(y_values) < y_bins[j + 1])
-            )
-            if np.any(mask):
-                throughput_grid[j, i] = np.sum(np.array(throughput)[mask])
+    x_bins, y_bins, throughput_grid, _ = _grid_cell_sums(
+        x_values, y_values, throughput, grid_size, use_fast_histogram
+    )
 
     # Plot heatmap
     im = ax.imshow(
@@ -255,21 +525,12 @@ def plot_throughput_heatmap(
         interpolation='bilinear'
     )
 
-    plt.colorbar(im, ax=ax, label='Total Throughput (bytes)')
+    fig.colorbar(im, ax=ax, label='Total Throughput (bytes)')
     ax.set_xlabel("X (meters)")
     ax.set_ylabel("Y (meters)")
     ax.set_title(title)
 
-    plt.tight_layout()
-
-    if output_path:
-        output_path.parent.mkdir(parents=True, exist_ok=True)
-        plt.savefig(output_path, dpi=150, bbox_inches='tight')
-        logger.info(f"Saved throughput heatmap to {output_path}")
-    else:
-        plt.show()
-
-    plt.close()
+    _finish_figure(fig, output_path, dpi, bbox_inches, owns_figure, "throughput heatmap")
 
 
 # ============================================================================
@@ -281,7 +542,11 @@ def plot_latency_time_series(
     vehicle_id: Optional[str] = None,
     output_path: Optional[Path] = None,
     title: str = "Latency Over Time",
-    figsize: tuple = (14, 6)
+    figsize: tuple = (14, 6),
+    dpi: int = DEFAULT_DPI,
+    bbox_inches: Optional[str] = None,
+    fig: Optional[Figure] = None,
+    color_by_vehicle: Optional[Dict[str, Any]] = None
 ) -> None:
     """Plot latency time series for one or all vehicles.
 
@@ -291,39 +556,55 @@ def plot_latency_time_series(
         output_path: Optional path to save figure
         title: Plot title
         figsize: Figure size
+        dpi: Resolution of the saved figure
+        bbox_inches: Passed to savefig; 'tight' costs an extra render pass
+        fig: Optional figure to clear and reuse instead of creating one
+        color_by_vehicle: Optional vehicle_id -> color mapping shared across
+                          plots (default: husl palette over these vehicles)
     """
     if not fused_records:
         logger.warning("No fused records to plot")
         return
 
-    fig, ax = plt.subplots(figsize=figsize)
+    fig, ax, owns_figure = _setup_figure(figsize, fig)
+
+    arrays = _records_to_arrays(
+        fused_records,
+        {'vehicle_id': object, 'timestamp_utc_ms': np.int64, 'avg_latency_ms': float}
+    )
+    all_timestamps = arrays['timestamp_utc_ms'] / 1000.0  # Convert to seconds
+    all_latencies = arrays['avg_latency_ms']
 
     if vehicle_id:
         # Plot single vehicle
-        vehicle_records = [r for r in fused_records if r.vehicle_id == vehicle_id]
-        if not vehicle_records:
+        vehicle_mask = arrays['vehicle_id'] == vehicle_id
+        if not vehicle_mask.any():
             logger.warning(f"No records found for vehicle {vehicle_id}")
             return
 
-        timestamps = [r.timestamp_utc_ms / 1000.0 for r in vehicle_records]  # Convert to seconds
-        latencies = [r.avg_latency_ms if r.avg_latency_ms is not None else np.nan
-                    for r in vehicle_records]
+        timestamps = all_timestamps[vehicle_mask]
+        latencies = all_latencies[vehicle_mask]
+        rasterized = len(timestamps) >= RASTERIZE_MIN_POINTS
+        timestamps, latencies = _maybe_decimate(timestamps, latencies)
 
-        ax.plot(timestamps, latencies, '-o', markersize=3, alpha=0.7)
+        ax.plot(timestamps, latencies, '-o', markersize=3, alpha=0.7, rasterized=rasterized)
         ax.set_title(f"{title} - {vehicle_id}")
     else:
         # Plot all vehicles
-        vehicles = set(r.vehicle_id for r in fused_records)
-        colors = sns.color_palette("husl", len(vehicles))
-
-        for idx, vid in enumerate(sorted(vehicles)):
-            vehicle_records = [r for r in fused_records if r.vehicle_id == vid]
-            timestamps = [r.timestamp_utc_ms / 1000.0 for r in vehicle_records]
-            latencies = [r.avg_latency_ms if r.avg_latency_ms is not None else np.nan
-                        for r in vehicle_records]
-
-            ax.plot(timestamps, latencies, '-', color=colors[idx], alpha=0.5,
-                   linewidth=1, label=vid if len(vehicles) <= 10 else None)
+        vehicles, order, ends = _group_slices(arrays['vehicle_id'])
+        if color_by_vehicle is None:
+            color_by_vehicle = _vehicle_palette(vehicles.tolist())
+        timestamps_by_vehicle = np.split(all_timestamps[order], ends[:-1])
+        latencies_by_vehicle = np.split(all_latencies[order], ends[:-1])
+        rasterized = len(fused_records) >= RASTERIZE_MIN_POINTS
+
+        for idx, vid in enumerate(vehicles):
+            timestamps, latencies = _maybe_decimate(
+                timestamps_by_vehicle[idx], latencies_by_vehicle[idx]
+            )
+            ax.plot(timestamps, latencies, '-', color=color_by_vehicle[vid], alpha=0.5,
+                   linewidth=1, label=vid if len(vehicles) <= 10 else None,
+                   rasterized=rasterized)
 
         ax.set_title(title)
         if len(vehicles) <= 10:
@@ -333,16 +614,7 @@ def plot_latency_time_series(
     ax.set_ylabel("Average Latency (ms)")
     ax.grid(True, alpha=0.3)
 
-    plt.tight_layout()
-
-    if output_path:
-        output_path.parent.mkdir(parents=True, exist_ok=True)
-        plt.savefig(output_path, dpi=150, bbox_inches='tight')
-        logger.info(f"Saved latency time series to {output_path}")
-    else:
-        plt.show()
-
-    plt.close()
+    _finish_figure(fig, output_path, dpi, bbox_inches, owns_figure, "latency time series")
 
 
 def plot_throughput_time_series(
@@ -350,7 +622,10 @@ def plot_throughput_time_series(
     vehicle_id: Optional[str] = None,
     output_path: Optional[Path] = None,
     title: str = "Throughput Over Time",
-    figsize: tuple = (14, 6)
+    figsize: tuple = (14, 6),
+    dpi: int = DEFAULT_DPI,
+    bbox_inches: Optional[str] = None,
+    fig: Optional[Figure] = None
 ) -> None:
     """Plot throughput time series for one or all vehicles.
 
@@ -360,45 +635,62 @@ def plot_throughput_time_series(
         output_path: Optional path to save figure
         title: Plot title
         figsize: Figure size
+        dpi: Resolution of the saved figure
+        bbox_inches: Passed to savefig; 'tight' costs an extra render pass
+        fig: Optional figure to clear and reuse instead of creating one
     """
     if not fused_records:
         logger.warning("No fused records to plot")
         return
 
-    fig, ax = plt.subplots(figsize=figsize)
+    fig, ax, owns_figure = _setup_figure(figsize, fig)
+
+    arrays = _records_to_arrays(
+        fused_records,
+        {'vehicle_id': object, 'timestamp_utc_ms': np.int64,
+         'tx_bytes': np.int64, 'rx_bytes': np.int64}
+    )
 
     if vehicle_id:
         # Plot single vehicle
-        vehicle_records = [r for r in fused_records if r.vehicle_id == vehicle_id]
-        if not vehicle_records:
+        vehicle_mask = arrays['vehicle_id'] == vehicle_id
+        if not vehicle_mask.any():
             logger.warning(f"No records found for vehicle {vehicle_id}")
             return
 
-        timestamps = [r.timestamp_utc_ms / 1000.0 for r in vehicle_records]
-        tx_bytes = [r.tx_bytes for r in vehicle_records]
-        rx_bytes = [r.rx_bytes for r in vehicle_records]
+        timestamps = arrays['timestamp_utc_ms'][vehicle_mask] / 1000.0
+        tx_bytes = arrays['tx_bytes'][vehicle_mask]
+        rx_bytes = arrays['rx_bytes'][vehicle_mask]
+        rasterized = len(timestamps) >= RASTERIZE_MIN_POINTS
+        timestamps, tx_bytes, rx_bytes = _maybe_decimate(timestamps, tx_bytes, rx_bytes)
 
-        ax.plot(timestamps, tx_bytes, '-o', markersize=3, alpha=0.7, label='TX')
-        ax.plot(timestamps, rx_bytes, '-s', markersize=3, alpha=0.7, label='RX')
+        ax.plot(timestamps, tx_bytes, '-o', markersize=3, alpha=0.7, label='TX',
+                rasterized=rasterized)
+        ax.plot(timestamps, rx_bytes, '-s', markersize=3, alpha=0.7, label='RX',
+                rasterized=rasterized)
         ax.set_title(f"{title} - {vehicle_id}")
         ax.legend()
     else:
-        # Plot aggregate throughput
-        df = pd.DataFrame([
-            {
-                'timestamp': r.timestamp_utc_ms / 1000.0,
-                'tx_bytes': r.tx_bytes,
-                'rx_bytes': r.rx_bytes
-            }
-            for r in fused_records
-        ])
-
-        # Group by time bins (1 second)
-        df['time_bin'] = (df['timestamp'] // 1).astype(int)
-        agg = df.groupby('time_bin').sum()
-
-        ax.plot(agg.index, agg['tx_bytes'], '-', alpha=0.7, label='Total TX', linewidth=2)
-        ax.plot(agg.index, agg['rx_bytes'], '-', alpha=0.7, label='Total RX', linewidth=2)
+        # Plot aggregate throughput, grouped by time bins (1 second)
+        time_bins = arrays['timestamp_utc_ms'] // 1000
+        first_bin = time_bins.min()
+        bin_idx = time_bins - first_bin
+        counts = np.bincount(bin_idx)
+        tx_per_bin = np.bincount(bin_idx, weights=arrays['tx_bytes'])
+        rx_per_bin = np.bincount(bin_idx, weights=arrays['rx_bytes'])
+
+        # Only seconds that have records, as a groupby would produce
+        occupied = np.flatnonzero(counts)
+        bin_seconds = first_bin + occupied
+        rasterized = len(bin_seconds) >= RASTERIZE_MIN_POINTS
+        bin_seconds, tx_total, rx_total = _maybe_decimate(
+            bin_seconds, tx_per_bin[occupied], rx_per_bin[occupied]
+        )
+
+        ax.plot(bin_seconds, tx_total, '-', alpha=0.7, label='Total TX',
+                linewidth=2, rasterized=rasterized)
+        ax.plot(bin_seconds, rx_total, '-', alpha=0.7, label='Total RX',
+                linewidth=2, rasterized=rasterized)
         ax.set_title(title)
         ax.legend()
 
@@ -406,16 +698,7 @@ def plot_throughput_time_series(
     ax.set_ylabel("Bytes")
     ax.grid(True, alpha=0.3)
 
-    plt.tight_layout()
-
-    if output_path:
-        output_path.parent.mkdir(parents=True, exist_ok=True)
-        plt.savefig(output_path, dpi=150, bbox_inches='tight')
-        logger.info(f"Saved throughput time series to {output_path}")
-    else:
-        plt.show()
-
-    plt.close()
+    _finish_figure(fig, output_path, dpi, bbox_inches, owns_figure, "throughput time series")
 
 
 # ============================================================================
@@ -425,7 +708,9 @@ def plot_throughput_time_series(
 def create_all_visualizations(
     trajectories_by_vehicle: Dict[str, List[TrajectorySample]],
     fused_records: List[FusedRecord],
-    output_dir: Path
+    output_dir: Path,
+    dpi: int = DEFAULT_DPI,
+    bbox_inches: Optional[str] = None
 ) -> None:
     """Create all standard visualizations and save to output directory.
 
@@ -433,6 +718,8 @@ def create_all_visualizations(
         trajectories_by_vehicle: Dict mapping vehicle_id to trajectory samples
         fused_records: List of fused records
         output_dir: Directory to save all plots
+        dpi: Resolution of the saved figures
+        bbox_inches: Passed to savefig for every figure
 
     Notes:
         Creates:
@@ -445,35 +732,54 @@ def create_all_visualizations(
     output_dir.mkdir(parents=True, exist_ok=True)
     logger.info(f"Creating visualizations in {output_dir}")
 
+    # One off-screen figure reused for every plot: no pyplot/GUI backend
+    # setup per plot, and nothing left open afterwards
+    save_kwargs = {'dpi': dpi, 'bbox_inches': bbox_inches, 'fig': Figure()}
+
+    # Same color for a vehicle in every plot; the palette is built once.
+    # Vehicles keep first-appearance order, so the trajectory map colors
+    # match a standalone plot_trajectory_map call.
+    vehicle_ids = list(dict.fromkeys(chain(
+        trajectories_by_vehicle, (record.vehicle_id for record in fused_records)
+    )))
+    color_by_vehicle = _vehicle_palette(vehicle_ids)
+
     # Trajectory map
     if trajectories_by_vehicle:
         plot_trajectory_map(
             trajectories_by_vehicle,
             output_path=output_dir / "trajectory_map.png",
-            show_quality=True
+            show_quality=True,
+            color_by_vehicle=color_by_vehicle,
+            **save_kwargs
         )
 
     # Heatmaps
     if fused_records:
         plot_latency_heatmap(
             fused_records,
-            output_path=output_dir / "latency_heatmap.png"
+            output_path=output_dir / "latency_heatmap.png",
+            **save_kwargs
         )
 
         plot_throughput_heatmap(
             fused_records,
-            output_path=output_dir / "throughput_heatmap.png"
+            output_path=output_dir / "throughput_heatmap.png",
+            **save_kwargs
         )
 
         # Time series
         plot_latency_time_series(
             fused_records,
-            output_path=output_dir / "latency_time_series.png"
+            output_path=output_dir / "latency_time_series.png",
+            color_by_vehicle=color_by_vehicle,
+            **save_kwargs
         )
 
         plot_throughput_time_series(
             fused_records,
-            output_path=output_dir / "throughput_time_series.png"
+            output_path=output_dir / "throughput_time_series.png",
+            **save_kwargs
         )
 
     logger.info("All visualizations created successfully")
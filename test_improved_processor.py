@@ -60,7 +60,8 @@ def main():
             input_dir=cfg.input_dir,
             output_dir=cfg.output_dir,
             output_format=cfg.format,
-            scenario_dirs=cfg.scenario_dirs
+            scenario_dirs=cfg.scenario_dirs,
+            workers=cfg.workers
         )
 
         print("\n" + "="*70)
@@ -1,6 +1,11 @@
+import json
 import sys
+import tempfile
 import unittest
 from pathlib import Path
+from unittest import mock
+
+import numpy as np
 
 # Ensure package under src is importable
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
@@ -10,6 +15,7 @@ sys.path.insert(0, str(SRC_DIR))
 from v2aix_pipeline.parser import (
     detect_timestamp_unit,
     normalize_timestamp,
+    normalize_timestamp_array,
     extract_vehicle_id,
     extract_latitude,
     extract_longitude,
@@ -18,7 +24,11 @@ from v2aix_pipeline.parser import (
     parse_gnss_record,
     parse_v2x_record,
     parse_records,
+    parse_records_batch,
+    iter_object_batches,
+    parse_json_file,
 )
+from v2aix_pipeline import parser
 from v2aix_pipeline.models import Direction
 
 
@@ -57,6 +67,21 @@ class TestTimestampUtilities(unittest.TestCase):
         # Auto-detect microseconds
         self.assertEqual(normalize_timestamp(1678901234000000), 1678901234000)
 
+    def test_normalize_timestamp_invalid_unit(self):
+        with self.assertRaises(ValueError):
+            normalize_timestamp(1678901234, 'minutes')
+
+    def test_normalize_timestamp_array(self):
+        timestamps = np.array([1678901234, 1678901234567, 1678901234567890, 1678901234.9])
+        expected = [normalize_timestamp(ts) for ts in timestamps]
+        result = normalize_timestamp_array(timestamps)
+        self.assertEqual(result.dtype, np.int64)
+        self.assertEqual(result.tolist(), expected)
+
+        result = normalize_timestamp_array(timestamps[:1], 'milliseconds')
+        self.assertEqual(result.tolist(), [1678901234])
+        self.assertEqual(len(normalize_timestamp_array(np.array([], dtype=np.int64))), 0)
+
 
 class TestFieldExtraction(unittest.TestCase):
     """Test field extraction from JSON objects"""
@@ -255,8 +280,10 @@ class TestV2XRecordParsing(unittest.TestCase):
 class TestBatchParsing(unittest.TestCase):
     """Test batch parsing of multiple records"""
 
-    def test_parse_records_mixed(self):
-        objects = [
+    @classmethod
+    def setUpClass(cls):
+        # Shared read-only inputs, built once for the class
+        cls.mixed_objects = (
             # GNSS record
             {
                 "stationID": "veh1",
@@ -276,10 +303,11 @@ class TestBatchParsing(unittest.TestCase):
                 "timestamp": 1678901235,
                 "latitude": 50.7755,
                 "longitude": 6.0840
-            }
-        ]
+            },
+        )
 
-        gnss_records, v2x_records = parse_records(objects)
+    def test_parse_records_mixed(self):
+        gnss_records, v2x_records = parse_records(self.mixed_objects)
 
         # GNSS records with coordinates
         self.assertEqual(len(gnss_records), 2)
@@ -320,6 +348,69 @@ class TestBatchParsing(unittest.TestCase):
         self.assertEqual(len(gnss_records), 1)
         self.assertEqual(len(v2x_records), 1)
 
+    def test_parse_records_batch_columns(self):
+        objects = [
+            {"station_id": 7, "lat": 50.0, "lon": 6.0, "timestamp": 1678901234},
+            {"stationID": "veh2", "latitude": 51.0, "longitude": "7.5",
+             "timestamp_utc_ms": 1678901235000000, "direction": "v2v",
+             "tx_timestamp": 1678901235000, "rx_timestamp": 1678901235030},
+            {"stationID": "veh3", "messageType": "CAM", "direction": "bad"},
+            "not a dict",
+        ]
+
+        gnss_df, v2x_df = parse_records_batch(objects)
+
+        self.assertEqual(gnss_df["vehicle_id"].tolist(), ["7", "veh2"])
+        self.assertEqual(gnss_df["timestamp_utc_ms"].tolist(), [1678901234000, 1678901235000])
+        self.assertEqual(gnss_df["longitude_deg"].tolist(), [6.0, 7.5])
+        self.assertTrue(gnss_df["altitude_m"].isna().all())
+
+        self.assertEqual(v2x_df["vehicle_id"].tolist(), ["7", "veh2", "veh3"])
+        self.assertEqual(v2x_df["direction"].isna().tolist(), [True, False, True])
+        self.assertEqual(v2x_df["latency_ms"].isna().tolist(), [True, False, True])
+        self.assertEqual(v2x_df["latency_ms"][1], 30.0)
+
+
+class TestFileParsing(unittest.TestCase):
+    """Test parsing records from JSON files"""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmpdir.name) / "records.json"
+        self.objects = [
+            {"stationID": f"veh{i}", "timestamp": 1678901234 + i,
+             "latitude": 50.0 + i * 0.1, "longitude": 6.0}
+            for i in range(5)
+        ]
+        self.path.write_text("  " + json.dumps(self.objects), encoding="utf-8")
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_iter_object_batches(self):
+        batches = list(iter_object_batches(self.path, batch_size=2))
+        self.assertEqual([len(b) for b in batches], [2, 2, 1])
+        self.assertEqual([obj for b in batches for obj in b], self.objects)
+
+    @unittest.skipUnless(parser.HAS_IJSON, "ijson not installed")
+    def test_iter_object_batches_streaming(self):
+        with mock.patch.object(parser, "STREAMING_THRESHOLD_BYTES", 0):
+            batches = list(iter_object_batches(self.path, batch_size=2))
+        self.assertEqual([len(b) for b in batches], [2, 2, 1])
+        self.assertEqual([obj for b in batches for obj in b], self.objects)
+
+    def test_parse_json_file(self):
+        gnss_df, v2x_df = parse_json_file(self.path, batch_size=2)
+        self.assertEqual(gnss_df["vehicle_id"].tolist(), [f"veh{i}" for i in range(5)])
+        self.assertEqual(gnss_df["timestamp_utc_ms"].tolist(),
+                         [(1678901234 + i) * 1000 for i in range(5)])
+        self.assertEqual(len(v2x_df), 5)
+
+    def test_parse_json_file_empty(self):
+        self.path.write_text("[]", encoding="utf-8")
+        gnss_df, v2x_df = parse_json_file(self.path)
+        self.assertEqual(len(gnss_df), 0)
+        self.assertEqual(list(v2x_df.columns), list(parse_records_batch([])[1].columns))
 
 if __name__ == "__main__":
     unittest.main()
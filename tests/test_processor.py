@@ -0,0 +1,172 @@
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+import pandas as pd
+
+# Ensure package under src is importable
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+SRC_DIR = PROJECT_ROOT / "src"
+sys.path.insert(0, str(SRC_DIR))
+
+from v2aix_pipeline.processor import (
+    TrajectoryColumns,
+    TrajectoryPoint,
+    V2XColumns,
+    V2XMessage,
+    _OutputSink,
+    extract_v2x_from_topic,
+    fuse_trajectory_and_v2x,
+)
+
+
+class TestFusion(unittest.TestCase):
+    """Test trajectory / V2X fusion by time window"""
+
+    def setUp(self):
+        self.trajectories = TrajectoryColumns.from_records([
+            TrajectoryPoint(timestamp_ms=1000, vehicle_id="veh1", latitude=50.0, longitude=6.0),
+            TrajectoryPoint(timestamp_ms=2000, vehicle_id="veh1", latitude=50.1, longitude=6.1),
+            TrajectoryPoint(timestamp_ms=1500, vehicle_id="veh2", latitude=51.0, longitude=7.0),
+        ])
+        self.messages = V2XColumns.from_records([
+            V2XMessage(timestamp_ms=500, vehicle_id="veh1", message_type="CAM",
+                       message_size_bytes=100, latency_ms=10.0),
+            V2XMessage(timestamp_ms=1200, vehicle_id="veh1", message_type="DENM",
+                       message_size_bytes=200),
+            V2XMessage(timestamp_ms=2500, vehicle_id="veh1", message_type="CAM",
+                       message_size_bytes=50, latency_ms=20.0),
+            V2XMessage(timestamp_ms=1500, vehicle_id="veh3", message_type="CAM",
+                       message_size_bytes=999),
+        ])
+
+    def test_window_metrics(self):
+        fused = fuse_trajectory_and_v2x(
+            self.trajectories, self.messages, time_window_ms=1000
+        ).to_records()
+
+        # Output is sorted by timestamp
+        self.assertEqual([f.timestamp_ms for f in fused], [1000, 1500, 2000])
+
+        # veh1 @ 1000: window [500, 1500] includes both boundary messages
+        first = fused[0]
+        self.assertEqual(first.messages_sent, 2)
+        self.assertEqual(first.total_bytes_sent, 300)
+        self.assertEqual(first.avg_latency_ms, 10.0)
+        self.assertEqual(first.message_types, "CAM,DENM")
+
+        # veh1 @ 2000: window [1500, 2500]
+        last = fused[2]
+        self.assertEqual(last.messages_sent, 1)
+        self.assertEqual(last.total_bytes_sent, 50)
+        self.assertEqual(last.avg_latency_ms, 20.0)
+        self.assertEqual(last.message_types, "CAM")
+
+    def test_vehicle_without_messages(self):
+        fused = fuse_trajectory_and_v2x(
+            self.trajectories, self.messages, time_window_ms=1000
+        ).to_records()
+
+        veh2 = fused[1]
+        self.assertEqual(veh2.vehicle_id, "veh2")
+        self.assertEqual(veh2.messages_sent, 0)
+        self.assertEqual(veh2.total_bytes_sent, 0)
+        self.assertIsNone(veh2.avg_latency_ms)
+        self.assertEqual(veh2.message_types, "")
+
+    def test_empty_inputs(self):
+        fused = fuse_trajectory_and_v2x(TrajectoryColumns.empty(), self.messages)
+        self.assertEqual(len(fused), 0)
+
+        fused = fuse_trajectory_and_v2x(self.trajectories, V2XColumns.empty())
+        self.assertEqual(len(fused), 3)
+        self.assertEqual(fused.messages_sent.tolist(), [0, 0, 0])
+
+    def test_columns_round_trip(self):
+        records = self.trajectories.to_records()
+        self.assertEqual(len(records), 3)
+        self.assertIsNone(records[0].speed_mps)
+        self.assertEqual(TrajectoryColumns.from_records(records).to_records(), records)
+
+
+class TestV2XExtraction(unittest.TestCase):
+    """Test V2X message extraction from topic records"""
+
+    @staticmethod
+    def _record(timestamp_ns, message):
+        return {'recording_timestamp_nsec': timestamp_ns, 'message': message}
+
+    def test_message_type_from_topic(self):
+        records = [
+            self._record(1_000_000, {'header': {'station_id': {'value': 7}}, 'cam': {}}),
+            self._record(2_000_000, {'header': {'station_id': {'value': 7}}}),
+            {'message': {}},  # no timestamp: skipped
+        ]
+        msgs = extract_v2x_from_topic(records, '/v2x/cam')
+        self.assertEqual(msgs.message_type.tolist(), ["CAM", "CAM"])
+        self.assertEqual(msgs.timestamp_ms.tolist(), [1, 2])
+        self.assertEqual(msgs.vehicle_id.tolist(), ["7", "7"])
+
+    def test_message_type_per_record(self):
+        records = [
+            self._record(1_000_000, {'cam': {}}),
+            self._record(2_000_000, {'denm': {}}),
+            self._record(3_000_000, {'data': [1, 2]}),
+        ]
+        msgs = extract_v2x_from_topic(records, '/v2x/raw')
+        self.assertEqual(msgs.message_type.tolist(), ["CAM", "DENM", "UNKNOWN"])
+        self.assertEqual(msgs.vehicle_id.tolist(), ["unknown"] * 3)
+
+
+class TestOutputSink(unittest.TestCase):
+    """Test streaming column batches to output files"""
+
+    def setUp(self):
+        self.batches = [
+            V2XColumns.from_records([
+                V2XMessage(timestamp_ms=1, vehicle_id="veh1", message_type="CAM",
+                           message_size_bytes=100, latency_ms=5.0),
+                V2XMessage(timestamp_ms=2, vehicle_id="veh1", message_type="DENM",
+                           message_size_bytes=200),
+            ]),
+            V2XColumns.empty(),
+            V2XColumns.from_records([
+                V2XMessage(timestamp_ms=3, vehicle_id="veh2", message_type="CAM",
+                           message_size_bytes=300),
+            ]),
+        ]
+        self.expected = V2XColumns.concat(self.batches).to_frame()
+
+    def test_parquet_round_trip(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / 'v2x.parquet'
+            sink = _OutputSink(path, V2XColumns, 'parquet')
+            for batch in self.batches:
+                sink.write(batch)
+            sink.close()
+
+            df = pd.read_parquet(path)
+            self.assertEqual(str(df['vehicle_id'].dtype), 'category')
+            self.assertEqual(list(df.columns), list(self.expected.columns))
+            self.assertEqual(df['timestamp_ms'].tolist(), [1, 2, 3])
+            self.assertEqual(df['vehicle_id'].tolist(), ["veh1", "veh1", "veh2"])
+            self.assertEqual(df['message_type'].tolist(), ["CAM", "DENM", "CAM"])
+            self.assertEqual(df['message_size_bytes'].tolist(), [100, 200, 300])
+            self.assertEqual(df['latency_ms'].isna().tolist(), [False, True, True])
+            self.assertTrue(df['sender_id'].isna().all())
+
+    def test_csv_round_trip(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / 'v2x.csv'
+            sink = _OutputSink(path, V2XColumns, 'csv')
+            for batch in self.batches:
+                sink.write(batch)
+            sink.close()
+
+            with open(path) as f:
+                self.assertEqual(f.read(), self.expected.to_csv(index=False))
+
+
+if __name__ == "__main__":
+    unittest.main()
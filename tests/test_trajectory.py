@@ -0,0 +1,233 @@
+import sys
+import unittest
+from pathlib import Path
+
+import numpy as np
+from scipy.signal import savgol_filter
+
+# Ensure package under src is importable
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+SRC_DIR = PROJECT_ROOT / "src"
+sys.path.insert(0, str(SRC_DIR))
+
+from v2aix_pipeline.trajectory import (
+    QUALITY_EXTRAPOLATED,
+    QUALITY_GAP,
+    QUALITY_LOW_SPEED,
+    _quality_bitmask_loop,
+    _quality_bitmask_numpy,
+    _savgol_operator,
+    _savgol_segments_loop,
+    _savgol_segments_numpy,
+    _scan_gaps_loop,
+    _scan_gaps_numpy,
+    create_gap_flags,
+    create_quality_flags,
+    detect_gaps,
+    detect_gaps_with_flags,
+    extract_trajectory,
+    group_records_by_vehicle,
+    quality_bitmask,
+    resample_many_to_1hz,
+    resample_to_1hz,
+    smooth_trajectory,
+)
+from v2aix_pipeline.models import GnssRecord
+
+
+class TestGrouping(unittest.TestCase):
+    """Test grouping GNSS records by vehicle"""
+
+    def test_group_records_by_vehicle(self):
+        records = [
+            GnssRecord(vehicle_id=vid, timestamp_utc_ms=ts, latitude_deg=lat, longitude_deg=6.0)
+            for vid, ts, lat in [
+                ("veh2", 3000, 1.0), ("veh1", 2000, 2.0), ("veh2", 1000, 3.0),
+                ("veh1", 2000, 4.0), ("veh1", 1000, 5.0),
+            ]
+        ]
+        grouped = group_records_by_vehicle(records)
+
+        # Vehicles in order of first appearance, records sorted by time
+        # (ties keep input order)
+        self.assertEqual(list(grouped), ["veh2", "veh1"])
+        self.assertEqual([r.latitude_deg for r in grouped["veh2"]], [3.0, 1.0])
+        self.assertEqual([r.latitude_deg for r in grouped["veh1"]], [5.0, 2.0, 4.0])
+        self.assertEqual(group_records_by_vehicle([]), {})
+
+
+class TestGapDetection(unittest.TestCase):
+    """Test gap detection and gap flags"""
+
+    def setUp(self):
+        self.timestamps = np.array([1000, 2000, 8000, 9000, 9500, 20000], dtype=np.int64)
+
+    def test_detect_gaps(self):
+        self.assertEqual(detect_gaps(self.timestamps, gap_threshold_s=5.0), [(1, 2), (4, 5)])
+        self.assertEqual(detect_gaps(np.array([1000]), gap_threshold_s=5.0), [])
+
+    def test_threshold_is_exclusive(self):
+        timestamps = np.array([0, 5000, 10001], dtype=np.int64)
+        self.assertEqual(detect_gaps(timestamps, gap_threshold_s=5.0), [(1, 2)])
+
+    def test_flags_match_create_gap_flags(self):
+        gaps, flags = detect_gaps_with_flags(self.timestamps, gap_threshold_s=5.0)
+        expected = create_gap_flags(len(self.timestamps), gaps)
+        np.testing.assert_array_equal(flags, expected)
+        self.assertEqual(flags.tolist(), [False, True, True, False, True, True])
+
+    def test_loop_and_numpy_kernels_agree(self):
+        rng = np.random.default_rng(0)
+        timestamps = np.cumsum(rng.integers(100, 9000, size=500))
+        for kernel_input in (timestamps, timestamps.astype(np.float64)):
+            starts_loop, flags_loop = _scan_gaps_loop(kernel_input, 5.0)
+            starts_np, flags_np = _scan_gaps_numpy(kernel_input, 5.0)
+            np.testing.assert_array_equal(starts_loop, starts_np)
+            np.testing.assert_array_equal(flags_loop, flags_np)
+
+
+class TestResampling(unittest.TestCase):
+    """Test 1Hz resampling"""
+
+    def setUp(self):
+        self.timestamps = np.array([0, 1500, 3000, 10000, 11000], dtype=np.int64)
+        self.values = np.array([
+            [10.0, 15.0, 20.0, 30.0, 31.0],
+            [1.0, np.nan, 3.0, 4.0, 5.0],
+        ])
+
+    def test_resample_grid_and_gap(self):
+        grid, resampled, extrap = resample_to_1hz(self.timestamps, self.values[0])
+        self.assertEqual(grid.tolist(), list(range(0, 12000, 1000)))
+        self.assertAlmostEqual(resampled[1], 13.333333333333334)
+        # Grid points strictly inside the 3000 -> 10000 gap are NaN
+        self.assertTrue(np.all(np.isnan(resampled[4:10])))
+        self.assertFalse(extrap.any())
+
+    def test_many_matches_single(self):
+        grid, resampled, extrap = resample_many_to_1hz(self.timestamps, self.values)
+        self.assertEqual(resampled.shape, (2, len(grid)))
+        for row, series in enumerate(self.values):
+            grid_1, resampled_1, extrap_1 = resample_to_1hz(self.timestamps, series)
+            np.testing.assert_array_equal(grid, grid_1)
+            np.testing.assert_array_equal(resampled[row], resampled_1)
+            np.testing.assert_array_equal(extrap, extrap_1)
+
+
+class TestSmoothing(unittest.TestCase):
+    """Test Savitzky-Golay smoothing"""
+
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.values = 50.0 + np.cumsum(rng.normal(scale=1e-4, size=40))
+
+    def test_matches_savgol_filter(self):
+        expected = savgol_filter(self.values, 7, 2, mode='interp')
+        np.testing.assert_allclose(smooth_trajectory(self.values, 7, 2), expected, rtol=1e-12)
+
+    def test_segments_between_gaps(self):
+        gaps = [(14, 15), (18, 19)]
+        smoothed = smooth_trajectory(self.values, 7, 2, gaps=gaps)
+
+        # Segments are [0:14], [15:18] and [19:40]
+        np.testing.assert_allclose(
+            smoothed[:14], savgol_filter(self.values[:14], 7, 2, mode='interp'), rtol=1e-12
+        )
+        # Segment [15:18] is shorter than the window and is left unchanged
+        np.testing.assert_array_equal(smoothed[14:19], self.values[14:19])
+        np.testing.assert_allclose(
+            smoothed[19:], savgol_filter(self.values[19:], 7, 2, mode='interp'), rtol=1e-12
+        )
+
+    def test_nan_handling(self):
+        # NaN in the interior propagates like savgol_filter's convolution
+        values = self.values.copy()
+        values[20] = np.nan
+        smoothed = smooth_trajectory(values, 7, 2)
+        self.assertTrue(np.all(np.isnan(smoothed[17:24])))
+        self.assertFalse(np.isnan(smoothed[:17]).any())
+
+        # NaN in an edge window: returned unchanged
+        values[20] = self.values[20]
+        values[1] = np.nan
+        np.testing.assert_array_equal(smooth_trajectory(values, 7, 2), values)
+
+    def test_loop_and_numpy_kernels_agree(self):
+        coeffs, left_edge, right_edge = _savgol_operator(7, 2)
+        starts = np.array([0, 15, 19], dtype=np.int64)
+        ends = np.array([14, 18, 40], dtype=np.int64)
+        out_loop = self.values.copy()
+        out_np = self.values.copy()
+        status_loop = _savgol_segments_loop(
+            self.values, coeffs, left_edge, right_edge, starts, ends, out_loop
+        )
+        status_np = _savgol_segments_numpy(
+            self.values, coeffs, left_edge, right_edge, starts, ends, out_np
+        )
+        np.testing.assert_array_equal(status_loop, status_np)
+        np.testing.assert_allclose(out_loop, out_np, rtol=1e-12)
+
+
+class TestQualityFlags(unittest.TestCase):
+    """Test quality flag bitmask and QualityFlags objects"""
+
+    def setUp(self):
+        self.gap_flags = np.array([False, True, False, True])
+        self.extrap_flags = np.array([False, False, True, True])
+        self.speeds = np.array([5.0, 0.5, np.nan])  # shorter than the flags
+
+    def test_bitmask(self):
+        bits = quality_bitmask(self.gap_flags, self.extrap_flags, self.speeds)
+        self.assertEqual(bits.tolist(), [
+            0,
+            QUALITY_GAP | QUALITY_LOW_SPEED,
+            QUALITY_EXTRAPOLATED,
+            QUALITY_GAP | QUALITY_EXTRAPOLATED,
+        ])
+        self.assertEqual(bits.dtype, np.uint8)
+
+    def test_create_quality_flags(self):
+        flags = create_quality_flags(self.gap_flags, self.extrap_flags, self.speeds)
+        self.assertEqual(
+            [(f.gap, f.extrapolated, f.low_speed) for f in flags],
+            [(False, False, False), (True, False, True),
+             (False, True, False), (True, True, False)]
+        )
+        self.assertFalse(any(f.low_speed for f in create_quality_flags(
+            self.gap_flags, self.extrap_flags
+        )))
+
+    def test_loop_and_numpy_kernels_agree(self):
+        args = (self.gap_flags, self.extrap_flags, self.speeds, 1.0)
+        np.testing.assert_array_equal(_quality_bitmask_loop(*args), _quality_bitmask_numpy(*args))
+
+
+class TestExtractTrajectory(unittest.TestCase):
+    """Test end-to-end trajectory extraction"""
+
+    def test_extract_with_gap(self):
+        # Unordered input, 1s spacing with a 10s gap after t=4s
+        times = [0, 1, 2, 3, 4, 14, 15, 16]
+        records = [
+            GnssRecord(vehicle_id="veh1", timestamp_utc_ms=t * 1000,
+                       latitude_deg=50.0 + t * 1e-4, longitude_deg=6.0,
+                       speed_mps=0.5 if t < 2 else None)
+            for t in reversed(times)
+        ]
+        trajectory = extract_trajectory(records, "veh1", apply_smoothing=False)
+
+        self.assertEqual([s.timestamp_utc_ms // 1000 for s in trajectory], times)
+        self.assertAlmostEqual(trajectory[-1].lat_deg, 50.0016)
+        self.assertIsNone(trajectory[0].alt_m)
+        self.assertEqual(trajectory[0].speed_mps, 0.5)
+        self.assertIsNone(trajectory[3].speed_mps)
+        self.assertTrue(trajectory[0].quality.low_speed)
+        self.assertTrue(trajectory[4].quality.gap)
+        self.assertFalse(trajectory[0].quality.gap)
+
+    def test_no_records(self):
+        self.assertEqual(extract_trajectory([], "veh1"), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
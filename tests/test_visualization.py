@@ -0,0 +1,177 @@
+import sys
+import unittest
+from pathlib import Path
+
+import matplotlib
+matplotlib.use("Agg")
+import numpy as np
+
+# Ensure package under src is importable
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+SRC_DIR = PROJECT_ROOT / "src"
+sys.path.insert(0, str(SRC_DIR))
+
+from v2aix_pipeline._binning import _bin2d_loop, _bin2d_numpy, bin2d_sum_count
+from v2aix_pipeline.models import FusedRecord, QualityFlags, TrajectorySample
+from v2aix_pipeline.visualization import (
+    HAS_FAST_HISTOGRAM,
+    _grid_cell_sums,
+    _group_slices,
+    _heatmap_grid_size,
+    _maybe_decimate,
+    _maybe_subsample,
+    _records_to_arrays,
+)
+
+
+class TestGridBinning(unittest.TestCase):
+    """Test uniform 2D grid binning used by the heatmaps"""
+
+    def test_matches_per_cell_masks(self):
+        rng = np.random.default_rng(0)
+        x = rng.uniform(-50, 50, size=500)
+        y = rng.uniform(0, 10, size=500)
+        weights = rng.uniform(0, 1, size=500)
+        grid_size = 6
+
+        x_bins, y_bins, sums, counts = _grid_cell_sums(x, y, weights, grid_size)
+
+        for i in range(grid_size - 1):
+            for j in range(grid_size - 1):
+                mask = (
+                    (x >= x_bins[i]) & (x < x_bins[i + 1]) &
+                    (y >= y_bins[j]) & (y < y_bins[j + 1])
+                )
+                self.assertEqual(counts[j, i], mask.sum())
+                self.assertAlmostEqual(sums[j, i], weights[mask].sum())
+
+    def test_max_edge_excluded(self):
+        x = np.array([0.0, 1.0, 2.0])
+        y = np.array([0.0, 0.5, 1.0])
+        _, _, sums, counts = _grid_cell_sums(x, y, np.ones(3), grid_size=3)
+        self.assertEqual(counts.sum(), 2)
+        self.assertEqual(counts[0, 0], 1)
+        self.assertEqual(counts[1, 1], 1)
+
+    @unittest.skipUnless(HAS_FAST_HISTOGRAM, "fast_histogram not installed")
+    def test_fast_histogram_matches_bincount(self):
+        rng = np.random.default_rng(1)
+        x = rng.uniform(-50, 50, size=1000)
+        y = rng.uniform(0, 10, size=1000)
+        weights = rng.uniform(0, 1, size=1000)
+
+        _, _, sums_fast, counts_fast = _grid_cell_sums(x, y, weights, 8)
+        _, _, sums, counts = _grid_cell_sums(x, y, weights, 8, use_fast_histogram=False)
+        np.testing.assert_array_equal(counts_fast, counts)
+        np.testing.assert_allclose(sums_fast, sums)
+
+    def test_heatmap_grid_size(self):
+        self.assertEqual(_heatmap_grid_size(250, 50), 50)
+        self.assertEqual(_heatmap_grid_size(144, 50), 12)
+        self.assertEqual(_heatmap_grid_size(3, 50), 10)
+        self.assertEqual(_heatmap_grid_size(3, 5), 5)
+
+
+class TestBinningKernels(unittest.TestCase):
+    """Test the 2D sum/count binning kernels"""
+
+    def setUp(self):
+        rng = np.random.default_rng(2)
+        self.x = rng.uniform(0, 10, size=301)
+        self.y = rng.uniform(0, 5, size=301)
+        self.x[:3] = [np.nan, 10.0, 0.0]  # NaN and max edge dropped, min edge kept
+        self.weights = rng.uniform(0, 1, size=301)
+        self.args = (self.x, self.y, self.weights, 0.0, 10.0, 0.0, 5.0, 7, 4)
+
+    def test_loop_and_numpy_kernels_agree(self):
+        sums_np, counts_np = _bin2d_numpy(*self.args, 1)
+        for n_chunks in (1, 3):
+            sums_loop, counts_loop = _bin2d_loop(*self.args, n_chunks)
+            np.testing.assert_array_equal(counts_loop, counts_np)
+            np.testing.assert_allclose(sums_loop, sums_np)
+        self.assertEqual(counts_np.shape, (4, 7))
+        self.assertEqual(counts_np.sum(), 299)
+
+    def test_bin2d_sum_count(self):
+        sums, counts = bin2d_sum_count(*self.args)
+        sums_np, counts_np = _bin2d_numpy(*self.args, 1)
+        np.testing.assert_array_equal(counts, counts_np)
+        np.testing.assert_allclose(sums, sums_np)
+
+
+class TestDecimation(unittest.TestCase):
+    """Test polyline decimation and scatter subsampling"""
+
+    def test_short_input_unchanged(self):
+        x = np.arange(10.0)
+        y = x * 2
+        self.assertIs(_maybe_decimate(x, y, max_points=10)[0], x)
+        self.assertIs(_maybe_subsample(x, y, max_points=10)[1], y)
+
+    def test_decimate_keeps_endpoints(self):
+        x = np.arange(1001.0)
+        x_dec, y_dec = _maybe_decimate(x, -x, max_points=100)
+        self.assertLessEqual(len(x_dec), 100)
+        self.assertEqual(x_dec[0], 0.0)
+        self.assertEqual(x_dec[-1], 1000.0)
+        np.testing.assert_array_equal(y_dec, -x_dec)
+
+    def test_subsample_keeps_pairs_in_order(self):
+        x = np.arange(1000.0)
+        x_sub, y_sub = _maybe_subsample(x, -x, max_points=50)
+        self.assertEqual(len(x_sub), 50)
+        self.assertTrue(np.all(np.diff(x_sub) > 0))
+        np.testing.assert_array_equal(y_sub, -x_sub)
+
+
+class TestRecordsToArrays(unittest.TestCase):
+    """Test single-pass record -> array extraction"""
+
+    def test_fused_records(self):
+        records = [
+            FusedRecord(vehicle_id="veh1", timestamp_utc_ms=1000, x_m=1.0, y_m=2.0,
+                        tx_bytes=10, rx_bytes=0, avg_latency_ms=5.0),
+            FusedRecord(vehicle_id="veh2", timestamp_utc_ms=2000, x_m=3.0, y_m=4.0),
+        ]
+        arrays = _records_to_arrays(
+            records,
+            {'vehicle_id': object, 'timestamp_utc_ms': np.int64,
+             'tx_bytes': np.int64, 'avg_latency_ms': float}
+        )
+        self.assertEqual(arrays['vehicle_id'].tolist(), ["veh1", "veh2"])
+        self.assertEqual(arrays['timestamp_utc_ms'].dtype, np.int64)
+        self.assertEqual(arrays['tx_bytes'].tolist(), [10, 0])
+        self.assertEqual(arrays['avg_latency_ms'][0], 5.0)
+        self.assertTrue(np.isnan(arrays['avg_latency_ms'][1]))
+
+    def test_dotted_fields(self):
+        records = [
+            TrajectorySample(vehicle_id="veh1", timestamp_utc_ms=0, lat_deg=0.0, lon_deg=0.0,
+                             x_m=0.0, y_m=0.0, quality=QualityFlags(gap=True)),
+            TrajectorySample(vehicle_id="veh1", timestamp_utc_ms=1000, lat_deg=0.0, lon_deg=0.0,
+                             x_m=1.0, y_m=0.0),
+        ]
+        arrays = _records_to_arrays(records, {'quality.gap': bool})
+        self.assertEqual(arrays['quality.gap'].tolist(), [True, False])
+
+    def test_empty(self):
+        arrays = _records_to_arrays([], {'x_m': float})
+        self.assertEqual(len(arrays['x_m']), 0)
+
+
+class TestGroupSlices(unittest.TestCase):
+    """Test single-sort grouping by key"""
+
+    def test_groups_keep_record_order(self):
+        keys = np.array(["veh2", "veh1", "veh2", "veh3", "veh1"], dtype=object)
+        values = np.arange(len(keys))
+
+        unique_keys, order, ends = _group_slices(keys)
+        groups = np.split(values[order], ends[:-1])
+
+        self.assertEqual(unique_keys.tolist(), ["veh1", "veh2", "veh3"])
+        self.assertEqual([g.tolist() for g in groups], [[1, 4], [0, 2], [3]])
+
+
+if __name__ == "__main__":
+    unittest.main()
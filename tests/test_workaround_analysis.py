@@ -0,0 +1,43 @@
+import io
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+# Ensure the root-level analysis script is importable
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+import workaround_analysis
+
+
+class TestMessageTypeStats(unittest.TestCase):
+    """Test the batched per-message-type statistics (scheme 4)"""
+
+    def test_std_with_large_messages(self):
+        # Squares of int32 sizes >= 46341 overflow int32
+        table = pa.table({
+            'message_type': pa.array(['CAM', 'CAM', 'CAM', 'DENM'], pa.string()),
+            'message_size_bytes': pa.array([50000, 60000, 70000, 100], pa.int32()),
+        })
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "v2x_messages.parquet"
+            pq.write_table(table, path)
+            with mock.patch.object(workaround_analysis, "V2X_PATH", path), \
+                 mock.patch.object(workaround_analysis, "V2X_BATCH_ROWS", 2):
+                stats = workaround_analysis.scheme_4(io.StringIO())['msg_type_stats']
+
+        self.assertEqual(stats['message_type'].tolist(), ['CAM', 'DENM'])
+        self.assertEqual(stats[('message_size_bytes', 'mean')].tolist(), [60000.0, 100.0])
+        self.assertEqual(stats[('message_size_bytes', 'std')][0], 10000.0)
+        self.assertTrue(pd.isna(stats[('message_size_bytes', 'std')][1]))
+        self.assertEqual(stats[('message_size_bytes', 'max')].tolist(), [70000, 100])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -4,155 +4,385 @@
 
 由于当前数据的vehicle_id识别不完整，这个脚本展示如何
 在不依赖vehicle_id的情况下进行有意义的分析。
+
+方案1-4互相独立，在线程池中并行计算（pandas/NumPy的聚合内核会释放GIL），
+各自的输出先写入缓冲区，再按方案顺序打印；方案5使用前面的结果导出数据。
+V2X表按批流式读取：每批计算可合并的部分聚合后再合并，内存占用只与批大小有关。
 """
 
-import pandas as pd
+import io
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, TextIO, Tuple
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
 
 BASE_PATH = Path("output/processed_full")
+V2X_PATH = BASE_PATH / "v2x_messages.parquet"
+FUSED_PATH = BASE_PATH / "fused_data.parquet"
 
-print("="*70)
-print("V2X数据分析 - 变通方案（忽略vehicle_id问题）")
-print("="*70)
+# 只读取分析用到的列（Parquet按列存储，未读取的列不产生IO和解压开销）
+FUSED_COLUMNS = ["latitude", "longitude", "messages_sent", "total_bytes_sent", "timestamp_ms"]
 
-# ============================================================================
-# 方案1: 只分析有效的V2X消息（排除unknown）
-# ============================================================================
+# 有效车辆ID：排除'unknown'（缺失的ID保留，与pandas的 != 比较一致）
+VALID_VEHICLE_FILTER = pc.field('vehicle_id').is_null() | (pc.field('vehicle_id') != 'unknown')
+
+# 创建空间网格
+grid_size = 0.001  # 约110米
+
+# lon索引加上偏移后作为低32位（无符号），打包后的int64键与(lat_grid, lon_grid)字典序一致
+CELL_LON_OFFSET = 1 << 31
+CELL_LOW_MASK = 0xFFFFFFFF
+
+MS_PER_HOUR = 3_600_000
+
+MAX_WORKERS = 4
+
+# 流式读取V2X表时每批的行数
+V2X_BATCH_ROWS = 1 << 20
+
+# Parquet输出：ZSTD压缩 + 字典编码（vehicle_id/message_type等重复值多的列收益明显）
+PARQUET_WRITE_OPTIONS = {
+    'compression': 'zstd',
+    'compression_level': 3,
+    'use_dictionary': True,
+}
+PARQUET_ROW_GROUP_SIZE = 1 << 18
+
+
+def top_k(df: pd.DataFrame, col: str, k: int) -> pd.DataFrame:
+    """等价于 df.nlargest(k, col)（并列时保持原顺序），用argpartition部分选择代替全排序"""
+    values = df[col].to_numpy()
+    if len(values) > k:
+        kth = values[np.argpartition(values, len(values) - k)[len(values) - k]]
+        candidates = np.flatnonzero(values >= kth)
+    else:
+        candidates = np.arange(len(values))
+    order = np.argsort(-values[candidates], kind='stable')[:k]
+    return df.iloc[candidates[order]]
+
+
+def to_grid_index(coords: np.ndarray, inv_grid_size: float) -> np.ndarray:
+    """坐标 -> 网格索引: floor(coords / grid_size), 只分配一个临时float数组"""
+    scaled = np.multiply(coords, inv_grid_size)
+    np.floor(scaled, out=scaled)
+    return scaled.astype(np.int64)
+
+
+def pack_cell_key(lat_grid: np.ndarray, lon_grid: np.ndarray) -> np.ndarray:
+    """(lat_grid, lon_grid) -> 单个int64网格键，单列groupby比两列MultiIndex快"""
+    return (lat_grid << 32) | (lon_grid + CELL_LON_OFFSET)
+
+
+def unpack_cell_key(cell: np.ndarray) -> tuple:
+    """pack_cell_key的逆运算"""
+    return cell >> 32, (cell & CELL_LOW_MASK) - CELL_LON_OFFSET
 
-print("\n[方案1] 分析有station_id的V2X消息...")
 
-v2x = pd.read_parquet(BASE_PATH / "v2x_messages.parquet")
-v2x['timestamp'] = pd.to_datetime(v2x['timestamp_ms'], unit='ms')
+def plain_schema(schema: pa.Schema) -> pa.Schema:
+    """字典编码列（pandas category写出）换成其值类型，Arrow的分组/排序/拼接不受不同批次字典的影响"""
+    return pa.schema([
+        pa.field(f.name, f.type.value_type if pa.types.is_dictionary(f.type) else f.type)
+        for f in schema
+    ])
 
-# 过滤出有效的车辆ID
-valid_v2x = v2x[v2x['vehicle_id'] != 'unknown'].copy()
 
-print(f"  原始V2X消息: {len(v2x):,}")
-print(f"  有效消息: {len(valid_v2x):,} ({len(valid_v2x)/len(v2x)*100:.1f}%)")
-print(f"  实际车辆数: {valid_v2x['vehicle_id'].nunique()}")
+def iter_v2x_batches(columns: Optional[List[str]] = None) -> Iterator[pa.Table]:
+    """按批读取V2X表（columns为None时读取全部列）"""
+    parquet_file = pq.ParquetFile(V2X_PATH)
+    schema = None
+    for batch in parquet_file.iter_batches(batch_size=V2X_BATCH_ROWS, columns=columns):
+        if schema is None:
+            schema = plain_schema(batch.schema)
+        yield pa.Table.from_batches([batch]).cast(schema)
 
-# 分析每个车辆的通信行为
-vehicle_stats = valid_v2x.groupby('vehicle_id').agg({
-    'message_size_bytes': ['count', 'sum', 'mean'],
-    'timestamp_ms': ['min', 'max']
-}).reset_index()
 
-vehicle_stats.columns = ['vehicle_id', 'msg_count', 'total_bytes', 'avg_size', 'first_seen', 'last_seen']
-vehicle_stats['duration_hours'] = (vehicle_stats['last_seen'] - vehicle_stats['first_seen']) / (1000 * 3600)
+def merged_std(count: pd.Series, total: pd.Series, total_sq: pd.Series) -> List[float]:
+    """由合并后的count/sum/平方和计算样本标准差（ddof=1），用Python整数精确计算避免相减抵消"""
+    return [
+        ((n * sq - s * s) / (n * (n - 1))) ** 0.5 if n > 1 else float('nan')
+        for n, s, sq in zip(count.tolist(), total.tolist(), total_sq.tolist())
+    ]
 
-print(f"\n车辆通信统计（有效车辆）:")
-print(vehicle_stats[['msg_count', 'total_bytes', 'duration_hours']].describe())
 
-# Top 10活跃车辆
-print(f"\n最活跃的10辆车:")
-top10 = vehicle_stats.nlargest(10, 'msg_count')[['vehicle_id', 'msg_count', 'total_bytes', 'duration_hours']]
-print(top10.to_string())
+def load_fused() -> pd.DataFrame:
+    return pd.read_parquet(FUSED_PATH, columns=FUSED_COLUMNS, engine="pyarrow")
+
+
+def run_scheme(scheme: Callable[..., Dict[str, Any]], *args: Any) -> Tuple[Dict[str, Any], str]:
+    """运行一个方案，返回(结果, 缓冲的输出文本)"""
+    out = io.StringIO()
+    result = scheme(*args, out=out)
+    return result, out.getvalue()
+
+
+# ============================================================================
+# 方案1: 只分析有效的V2X消息（排除unknown）
+# ============================================================================
+
+def scheme_1(out: TextIO) -> Dict[str, Any]:
+    print("\n[方案1] 分析有station_id的V2X消息...", file=out)
+
+    # 过滤和分组聚合用pyarrow compute内核在Arrow内存上完成；
+    # 每批只保留每辆车的count/sum/min/max部分聚合，最后合并
+    n_total = 0
+    n_valid = 0
+    partials = []
+    for batch in iter_v2x_batches(['vehicle_id', 'timestamp_ms', 'message_size_bytes']):
+        valid_batch = batch.filter(VALID_VEHICLE_FILTER)
+        n_total += batch.num_rows
+        n_valid += valid_batch.num_rows
+        partials.append(valid_batch.group_by('vehicle_id').aggregate([
+            ('message_size_bytes', 'count'),
+            ('message_size_bytes', 'sum'),
+            ('timestamp_ms', 'min'),
+            ('timestamp_ms', 'max'),
+        ]))
+
+    # 分析每个车辆的通信行为（缺失ID不成组，按vehicle_id排序）
+    vehicle_stats = (
+        pa.concat_tables(partials).group_by('vehicle_id')
+        .aggregate([
+            ('message_size_bytes_count', 'sum'),
+            ('message_size_bytes_sum', 'sum'),
+            ('timestamp_ms_min', 'min'),
+            ('timestamp_ms_max', 'max'),
+        ])
+        .filter(pc.field('vehicle_id').is_valid())
+        .sort_by('vehicle_id')
+        .rename_columns(['vehicle_id', 'msg_count', 'total_bytes', 'first_seen', 'last_seen'])
+        .to_pandas()
+    )
+    vehicle_stats.insert(3, 'avg_size', vehicle_stats['total_bytes'] / vehicle_stats['msg_count'])
+    n_vehicles = len(vehicle_stats)
+
+    print(f"  原始V2X消息: {n_total:,}", file=out)
+    print(f"  有效消息: {n_valid:,} ({n_valid/n_total*100:.1f}%)", file=out)
+    print(f"  实际车辆数: {n_vehicles}", file=out)
+
+    # DataFrame.eval在安装了numexpr时一次遍历完成减法和除法（否则退回普通pandas运算）
+    vehicle_stats['duration_hours'] = vehicle_stats.eval('(last_seen - first_seen) / @MS_PER_HOUR')
+
+    print(f"\n车辆通信统计（有效车辆）:", file=out)
+    print(vehicle_stats[['msg_count', 'total_bytes', 'duration_hours']].describe(), file=out)
+
+    # Top 10活跃车辆
+    print(f"\n最活跃的10辆车:", file=out)
+    top10 = top_k(vehicle_stats, 'msg_count', 10)[['vehicle_id', 'msg_count', 'total_bytes', 'duration_hours']]
+    top10.to_string(buf=out)
+    out.write("\n")
+
+    return {'n_valid': n_valid, 'n_vehicles': n_vehicles, 'vehicle_stats': vehicle_stats}
+
 
 # ============================================================================
 # 方案2: 空间聚类分析（不依赖vehicle_id）
 # ============================================================================
 
-print("\n\n[方案2] 基于位置的聚类分析（不使用vehicle_id）...")
+def scheme_2(fused: pd.DataFrame, out: TextIO) -> Dict[str, Any]:
+    print("\n\n[方案2] 基于位置的聚类分析（不使用vehicle_id）...", file=out)
 
-fused = pd.read_parquet(BASE_PATH / "fused_data.parquet")
-fused['timestamp'] = pd.to_datetime(fused['timestamp_ms'], unit='ms')
+    inv_grid_size = 1.0 / grid_size
+    lat_grid = to_grid_index(fused['latitude'].to_numpy(dtype=np.float64), inv_grid_size)
+    lon_grid = to_grid_index(fused['longitude'].to_numpy(dtype=np.float64), inv_grid_size)
+    fused['cell'] = pack_cell_key(lat_grid, lon_grid)
 
-# 创建空间网格
-grid_size = 0.001  # 约110米
-fused['lat_grid'] = (fused['latitude'] / grid_size).astype(int)
-fused['lon_grid'] = (fused['longitude'] / grid_size).astype(int)
+    # 统计每个网格的活动
+    grid_stats = fused.groupby('cell').agg(
+        total_messages=('messages_sent', 'sum'),
+        total_bytes=('total_bytes_sent', 'sum'),
+        num_samples=('timestamp_ms', 'count'),
+    ).reset_index()
+
+    grid_lat, grid_lon = unpack_cell_key(grid_stats.pop('cell').to_numpy())
+    grid_stats.insert(0, 'lat_grid', grid_lat)
+    grid_stats.insert(1, 'lon_grid', grid_lon)
 
-# 统计每个网格的活动
-grid_stats = fused.groupby(['lat_grid', 'lon_grid']).agg({
-    'messages_sent': 'sum',
-    'total_bytes_sent': 'sum',
-    'timestamp_ms': 'count'
-}).reset_index()
+    # 只看有通信活动的网格
+    active_grids = grid_stats[grid_stats['total_messages'] > 0]
 
-grid_stats.columns = ['lat_grid', 'lon_grid', 'total_messages', 'total_bytes', 'num_samples']
+    n_grids = len(grid_stats)
+    n_active_grids = len(active_grids)
 
-# 只看有通信活动的网格
-active_grids = grid_stats[grid_stats['total_messages'] > 0]
+    print(f"  总网格数: {n_grids:,}", file=out)
+    print(f"  有通信活动的网格: {n_active_grids:,}", file=out)
+    print(f"  平均每网格消息数: {active_grids['total_messages'].mean():.1f}", file=out)
 
-print(f"  总网格数: {len(grid_stats):,}")
-print(f"  有通信活动的网格: {len(active_grids):,}")
-print(f"  平均每网格消息数: {active_grids['total_messages'].mean():.1f}")
+    # 热点区域
+    print(f"\n通信热点区域（Top 10）:", file=out)
+    hotspots = top_k(active_grids, 'total_messages', 10)
+    hotspots.to_string(buf=out)
+    out.write("\n")
+
+    return {'active_grids': active_grids}
 
-# 热点区域
-print(f"\n通信热点区域（Top 10）:")
-hotspots = active_grids.nlargest(10, 'total_messages')
-print(hotspots.to_string())
 
 # ============================================================================
 # 方案3: 时间模式分析（不依赖vehicle_id）
 # ============================================================================
 
-print("\n\n[方案3] 时间模式分析...")
+def scheme_3(out: TextIO) -> Dict[str, Any]:
+    print("\n\n[方案3] 时间模式分析...", file=out)
+
+    # 整数运算得到自epoch起的小时数（UTC），不构造datetime和date对象；
+    # 每批只做一次分组（每个"日期+小时"一组），合并后小时/日期统计都由这个小结果汇总得到
+    partials = []
+    for batch in iter_v2x_batches(['timestamp_ms', 'message_size_bytes']):
+        epoch_hour = batch['timestamp_ms'].to_numpy() // MS_PER_HOUR
+        sizes = batch['message_size_bytes'].to_pandas()
+        partials.append(sizes.groupby(epoch_hour).agg(['count', 'sum']))
+
+    per_hour = pd.concat(partials).groupby(level=0).sum()
+    epoch_hours = per_hour.index.to_numpy()
 
-v2x['hour'] = v2x['timestamp'].dt.hour
-v2x['date'] = v2x['timestamp'].dt.date
+    # 按小时统计
+    hourly = per_hour.groupby(epoch_hours % 24).sum().reset_index()
+    hourly.columns = ['hour', 'msg_count', 'total_bytes']
 
-# 按小时统计
-hourly = v2x.groupby('hour').agg({
-    'message_size_bytes': ['count', 'sum']
-}).reset_index()
-hourly.columns = ['hour', 'msg_count', 'total_bytes']
+    print(f"\n每小时消息分布:", file=out)
+    hourly.to_string(buf=out)
+    out.write("\n")
 
-print(f"\n每小时消息分布:")
-print(hourly.to_string())
+    # 按日期统计
+    daily = per_hour.groupby(epoch_hours // 24).sum().reset_index()
+    daily.columns = ['day', 'msg_count', 'total_bytes']
+    # 只在结果上转换为可读日期
+    daily.insert(0, 'date', pd.to_datetime(daily.pop('day'), unit='D').dt.date)
 
-# 按日期统计
-daily = v2x.groupby('date').agg({
-    'message_size_bytes': ['count', 'sum']
-}).reset_index()
-daily.columns = ['date', 'msg_count', 'total_bytes']
+    print(f"\n每日消息量:", file=out)
+    daily.head(10).to_string(buf=out)
+    out.write("\n")
+
+    return {}
 
-print(f"\n每日消息量:")
-print(daily.head(10).to_string())
 
 # ============================================================================
 # 方案4: 消息类型分析
 # ============================================================================
 
-print("\n\n[方案4] 消息类型分析...")
-
-msg_type_stats = v2x.groupby('message_type').agg({
-    'message_size_bytes': ['count', 'mean', 'std', 'min', 'max']
-}).reset_index()
+def scheme_4(out: TextIO) -> Dict[str, Any]:
+    print("\n\n[方案4] 消息类型分析...", file=out)
+
+    # 每批按消息类型计算count/sum/平方和/min/max，合并后再得到均值和标准差
+    partials = []
+    for batch in iter_v2x_batches(['message_type', 'message_size_bytes']):
+        # 平方前转为int64：int32上的乘法会在46341字节及以上溢出回绕
+        sizes = pc.cast(batch['message_size_bytes'], pa.int64())
+        batch = batch.append_column('size_sq', pc.multiply_checked(sizes, sizes))
+        partials.append(batch.group_by('message_type').aggregate([
+            ('message_size_bytes', 'count'),
+            ('message_size_bytes', 'sum'),
+            ('size_sq', 'sum'),
+            ('message_size_bytes', 'min'),
+            ('message_size_bytes', 'max'),
+        ]))
+
+    merged = (
+        pa.concat_tables(partials).group_by('message_type')
+        .aggregate([
+            ('message_size_bytes_count', 'sum'),
+            ('message_size_bytes_sum', 'sum'),
+            ('size_sq_sum', 'sum'),
+            ('message_size_bytes_min', 'min'),
+            ('message_size_bytes_max', 'max'),
+        ])
+        .filter(pc.field('message_type').is_valid())
+        .sort_by('message_type')
+        .rename_columns(['message_type', 'count', 'sum', 'sum_sq', 'min', 'max'])
+        .to_pandas()
+    )
+
+    msg_type_stats = pd.DataFrame({
+        ('message_type', ''): merged['message_type'],
+        ('message_size_bytes', 'count'): merged['count'],
+        ('message_size_bytes', 'mean'): merged['sum'] / merged['count'],
+        ('message_size_bytes', 'std'): merged_std(merged['count'], merged['sum'], merged['sum_sq']),
+        ('message_size_bytes', 'min'): merged['min'],
+        ('message_size_bytes', 'max'): merged['max'],
+    })
+
+    print(f"\n消息类型统计:", file=out)
+    msg_type_stats.to_string(buf=out)
+    out.write("\n")
+
+    return {'msg_type_stats': msg_type_stats}
 
-print(f"\n消息类型统计:")
-print(msg_type_stats.to_string())
 
 # ============================================================================
 # 方案5: 导出有效数据用于后续分析
 # ============================================================================
 
-print("\n\n[方案5] 导出有效数据...")
-
-# 只保存有vehicle_id的数据
-valid_v2x.to_parquet(BASE_PATH / "v2x_messages_valid.parquet", index=False)
-print(f"  ✓ 导出有效V2X消息到: {BASE_PATH / 'v2x_messages_valid.parquet'}")
-print(f"    ({len(valid_v2x):,} 条记录, {valid_v2x['vehicle_id'].nunique()} 辆车)")
-
-# 导出活跃网格数据
-active_grids.to_csv(BASE_PATH / "spatial_hotspots.csv", index=False)
-print(f"  ✓ 导出空间热点数据到: {BASE_PATH / 'spatial_hotspots.csv'}")
-
-# 导出车辆统计
-vehicle_stats.to_csv(BASE_PATH / "vehicle_statistics.csv", index=False)
-print(f"  ✓ 导出车辆统计到: {BASE_PATH / 'vehicle_statistics.csv'}")
-
-print("\n" + "="*70)
-print("分析完成！")
-print("="*70)
-
-print("\n💡 使用建议:")
-print("  1. 使用 v2x_messages_valid.parquet 进行车辆级别的分析")
-print("  2. 使用 spatial_hotspots.csv 进行空间分析")
-print("  3. 使用 vehicle_statistics.csv 了解各车辆的通信行为")
-print("  4. trajectories 和 fused_data 可用于整体时空分析（不区分车辆）")
-
-print("\n⚠️  局限性:")
-print("  - 无法追踪单个车辆的完整轨迹")
-print("  - 无法做车辆间的交互分析（V2V）")
-print("  - 建议按 VEHICLE_ID_ISSUE.md 中的方案改进处理代码后重新处理")
+def scheme_5(n_valid: int, n_vehicles: int, active_grids: pd.DataFrame, vehicle_stats: pd.DataFrame) -> None:
+    print("\n\n[方案5] 导出有效数据...")
+
+    # 只保存有vehicle_id的数据（导出全部列：按批过滤后逐批写出，不在内存中保留整表）
+    schema = plain_schema(pq.read_schema(V2X_PATH)).append(pa.field('timestamp', pa.timestamp('ms')))
+    with pq.ParquetWriter(BASE_PATH / "v2x_messages_valid.parquet", schema, **PARQUET_WRITE_OPTIONS) as writer:
+        for batch in iter_v2x_batches():
+            valid_batch = batch.filter(VALID_VEHICLE_FILTER)
+            valid_batch = valid_batch.append_column('timestamp', valid_batch['timestamp_ms'].cast(pa.timestamp('ms')))
+            writer.write_table(valid_batch, row_group_size=PARQUET_ROW_GROUP_SIZE)
+    print(f"  ✓ 导出有效V2X消息到: {BASE_PATH / 'v2x_messages_valid.parquet'}")
+    print(f"    ({n_valid:,} 条记录, {n_vehicles} 辆车)")
+
+    # 导出活跃网格数据（CSV便于直接查看，Parquet供后续程序读取）
+    active_grids.to_csv(BASE_PATH / "spatial_hotspots.csv", index=False)
+    active_grids.to_parquet(
+        BASE_PATH / "spatial_hotspots.parquet", index=False, engine="pyarrow",
+        row_group_size=PARQUET_ROW_GROUP_SIZE, **PARQUET_WRITE_OPTIONS
+    )
+    print(f"  ✓ 导出空间热点数据到: {BASE_PATH / 'spatial_hotspots.csv'} (.parquet)")
+
+    # 导出车辆统计
+    vehicle_stats.to_csv(BASE_PATH / "vehicle_statistics.csv", index=False)
+    vehicle_stats.to_parquet(
+        BASE_PATH / "vehicle_statistics.parquet", index=False, engine="pyarrow",
+        row_group_size=PARQUET_ROW_GROUP_SIZE, **PARQUET_WRITE_OPTIONS
+    )
+    print(f"  ✓ 导出车辆统计到: {BASE_PATH / 'vehicle_statistics.csv'} (.parquet)")
+
+
+def main():
+    print("="*70)
+    print("V2X数据分析 - 变通方案（忽略vehicle_id问题）")
+    print("="*70)
+
+    fused = load_fused()
+
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        futures = [
+            executor.submit(run_scheme, scheme_1),
+            executor.submit(run_scheme, scheme_2, fused),
+            executor.submit(run_scheme, scheme_3),
+            executor.submit(run_scheme, scheme_4),
+        ]
+        results = {}
+        for future in futures:
+            result, output = future.result()
+            print(output, end="")
+            results.update(result)
+
+    scheme_5(results['n_valid'], results['n_vehicles'], results['active_grids'], results['vehicle_stats'])
+
+    print("\n" + "="*70)
+    print("分析完成！")
+    print("="*70)
+
+    print("\n💡 使用建议:")
+    print("  1. 使用 v2x_messages_valid.parquet 进行车辆级别的分析")
+    print("  2. 使用 spatial_hotspots.csv 进行空间分析")
+    print("  3. 使用 vehicle_statistics.csv 了解各车辆的通信行为")
+    print("  4. trajectories 和 fused_data 可用于整体时空分析（不区分车辆）")
+
+    print("\n⚠️  局限性:")
+    print("  - 无法追踪单个车辆的完整轨迹")
+    print("  - 无法做车辆间的交互分析（V2V）")
+    print("  - 建议按 VEHICLE_ID_ISSUE.md 中的方案改进处理代码后重新处理")
+
+
+if __name__ == "__main__":
+    main()